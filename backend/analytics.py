@@ -0,0 +1,157 @@
+import argparse
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from models import ResumeVersion, UserScoreSummary
+
+MOST_IMPROVED_LIMIT = 3
+
+
+def _point(version: ResumeVersion, score: float) -> Dict:
+    created_at = version.created_at or datetime.utcnow()
+    return {'version_id': version.id, 'created_at': created_at.isoformat(), 'score': score}
+
+
+def _recompute(summary: UserScoreSummary, score_history: List[Dict], section_history: Dict[str, List[Dict]]) -> None:
+    # New list/dict objects are assigned so SQLAlchemy notices the JSON changes
+    score_history = sorted(score_history, key=lambda point: point['created_at'])
+    section_history = {
+        name: sorted(points, key=lambda point: point['created_at'])
+        for name, points in section_history.items() if points
+    }
+    scores = [point['score'] for point in score_history]
+
+    summary.score_history = score_history
+    summary.section_history = section_history
+    summary.version_count = len(scores)
+    summary.first_score = scores[0] if scores else None
+    summary.latest_score = scores[-1] if scores else None
+    summary.best_score = max(scores) if scores else None
+    summary.average_score = round(sum(scores) / len(scores), 1) if scores else None
+
+    improvements = [
+        {'section': name, 'change': round(points[-1]['score'] - points[0]['score'], 1)}
+        for name, points in section_history.items() if len(points) > 1
+    ]
+    improvements = [item for item in improvements if item['change'] > 0]
+    summary.most_improved = sorted(improvements, key=lambda item: item['change'], reverse=True)[:MOST_IMPROVED_LIMIT]
+
+
+def _existing_summary(db: Session, user_id: str) -> Optional[UserScoreSummary]:
+    return db.execute(
+        select(UserScoreSummary).where(UserScoreSummary.user_id == user_id).with_for_update()
+    ).scalar_one_or_none()
+
+
+def _locked_summary(db: Session, user_id: str) -> UserScoreSummary:
+    summary = _existing_summary(db, user_id)
+    if summary is not None:
+        return summary
+    summary = UserScoreSummary(user_id=user_id, version_count=0, score_history=[], section_history={}, most_improved=[])
+    try:
+        with db.begin_nested():
+            db.add(summary)
+    except IntegrityError:
+        # Created concurrently by another save for the same user
+        summary = _existing_summary(db, user_id)
+    return summary
+
+
+def record_version(db: Session, version: ResumeVersion) -> None:
+    """Fold a newly saved (flushed) version into its user's summary."""
+    summary = _existing_summary(db, version.user_id)
+    if summary is None:
+        # No summary yet (versions predating it, bulk-seeded or rescored users):
+        # build it from every version, the flushed one included
+        rebuild_summary(db, version.user_id)
+        return
+    section_history = {name: list(points) for name, points in (summary.section_history or {}).items()}
+    for name, score in (version.section_scores or {}).items():
+        section_history.setdefault(name, []).append(_point(version, score))
+    _recompute(summary, list(summary.score_history or []) + [_point(version, version.score)], section_history)
+
+
+def remove_version(db: Session, version: ResumeVersion) -> None:
+    # Called before the delete, so a rebuilt summary still contains the version
+    summary = _existing_summary(db, version.user_id) or rebuild_summary(db, version.user_id)
+    _recompute(
+        summary,
+        [point for point in summary.score_history or [] if point['version_id'] != version.id],
+        {
+            name: [point for point in points if point['version_id'] != version.id]
+            for name, points in (summary.section_history or {}).items()
+        }
+    )
+
+
+def rebuild_summary(db: Session, user_id: str) -> UserScoreSummary:
+    """Recompute a summary from the user's versions (backfill and repair)."""
+    summary = _locked_summary(db, user_id)
+    score_history = []
+    section_history: Dict[str, List[Dict]] = {}
+    rows = db.execute(
+        select(ResumeVersion.id, ResumeVersion.created_at, ResumeVersion.score, ResumeVersion.section_scores)
+        .where(ResumeVersion.user_id == user_id)
+    )
+    for row in rows:
+        score_history.append(_point(row, row.score))
+        for name, score in (row.section_scores or {}).items():
+            section_history.setdefault(name, []).append(_point(row, score))
+    _recompute(summary, score_history, section_history)
+    return summary
+
+
+def summary_to_dict(summary: UserScoreSummary) -> Dict:
+    return {
+        'user_id': summary.user_id,
+        'version_count': summary.version_count,
+        'first_score': summary.first_score,
+        'latest_score': summary.latest_score,
+        'best_score': summary.best_score,
+        'average_score': summary.average_score,
+        'score_history': summary.score_history or [],
+        'section_history': summary.section_history or {},
+        'most_improved': summary.most_improved or [],
+        'updated_at': summary.updated_at,
+    }
+
+
+def get_summary(db: Session, user_id: str) -> Optional[Dict]:
+    summary = db.get(UserScoreSummary, user_id)
+    if summary is None:
+        # Users whose versions predate the summaries (or were bulk-seeded)
+        # are summarized once on first read and maintained from then on
+        if db.execute(select(ResumeVersion.id).where(ResumeVersion.user_id == user_id).limit(1)).first() is None:
+            return None
+        summary = rebuild_summary(db, user_id)
+        db.commit()
+    return summary_to_dict(summary)
+
+
+def main(argv=None) -> None:
+    from database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Rebuild per-user score summaries")
+    parser.add_argument('--user-id', help="Only rebuild this user (default: every user with versions)")
+    args = parser.parse_args(argv)
+
+    db = SessionLocal()
+    try:
+        if args.user_id:
+            user_ids = [args.user_id]
+        else:
+            user_ids = db.execute(select(ResumeVersion.user_id).distinct()).scalars().all()
+        for user_id in user_ids:
+            rebuild_summary(db, user_id)
+            db.commit()
+        print(f"Rebuilt {len(user_ids)} summaries")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
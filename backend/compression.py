@@ -0,0 +1,152 @@
+import os
+import zlib
+from typing import List, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+COMPRESSION_MINIMUM_SIZE = int(os.getenv('COMPRESSION_MINIMUM_SIZE', 1024))
+GZIP_LEVEL = int(os.getenv('GZIP_LEVEL', 6))
+# Brotli quality 4 compresses better than gzip -6 at a similar CPU cost
+BROTLI_QUALITY = int(os.getenv('BROTLI_QUALITY', 4))
+# Payloads that are already compressed
+UNCOMPRESSIBLE_TYPES = ('application/zip', 'application/pdf', 'image/', 'video/', 'audio/')
+
+
+def accepted_encodings(accept_encoding: str) -> List[str]:
+    encodings = []
+    for item in accept_encoding.split(','):
+        name, _, params = item.strip().partition(';')
+        params = params.replace(' ', '')
+        if params.startswith('q='):
+            try:
+                if float(params[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        encodings.append(name.strip().lower())
+    return encodings
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    encodings = accepted_encodings(accept_encoding)
+    if brotli is not None and 'br' in encodings:
+        return 'br'
+    if 'gzip' in encodings:
+        return 'gzip'
+    return None
+
+
+class _Compressor:
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        if encoding == 'br':
+            self._brotli = brotli.Compressor(quality=brotli_quality)
+            self._zlib = None
+        else:
+            self._brotli = None
+            self._zlib = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)  # wbits 31: gzip container
+
+    def compress(self, data: bytes) -> bytes:
+        return self._brotli.process(data) if self._brotli else self._zlib.compress(data)
+
+    def finish(self) -> bytes:
+        return self._brotli.finish() if self._brotli else self._zlib.flush(zlib.Z_FINISH)
+
+
+class CompressionMiddleware:
+    """gzip/brotli response compression above a size threshold.
+
+    Works like Starlette's GZipMiddleware, but prefers brotli when the client
+    accepts it and leaves already-compressed payloads (zip exports, PDFs) alone.
+    """
+
+    def __init__(self, app, minimum_size: int = COMPRESSION_MINIMUM_SIZE,
+                 gzip_level: int = GZIP_LEVEL, brotli_quality: int = BROTLI_QUALITY):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get('accept-encoding', ''))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = _CompressionResponder(send, encoding, self.minimum_size, self.gzip_level, self.brotli_quality)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    def __init__(self, send, encoding: str, minimum_size: int, gzip_level: int, brotli_quality: int):
+        self._send = send
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.start_message = None
+        self.compressor: Optional[_Compressor] = None
+        self.passthrough = False
+
+    def _compressible(self, headers: Headers) -> bool:
+        if 'content-encoding' in headers:
+            return False
+        content_type = headers.get('content-type', '')
+        return not content_type.startswith(UNCOMPRESSIBLE_TYPES)
+
+    async def send(self, message) -> None:
+        if message['type'] == 'http.response.start':
+            # Held back until the first body chunk shows how large the response is
+            self.start_message = message
+            return
+        if message['type'] != 'http.response.body':
+            await self._send(message)
+            return
+
+        body = message.get('body', b'')
+        more_body = message.get('more_body', False)
+
+        if self.start_message is not None:
+            start, self.start_message = self.start_message, None
+            headers = MutableHeaders(raw=start['headers'])
+            if (not self._compressible(Headers(raw=start['headers']))
+                    or (not more_body and len(body) < self.minimum_size)):
+                self.passthrough = True
+                await self._send(start)
+                await self._send(message)
+                return
+
+            self.compressor = _Compressor(self.encoding, self.gzip_level, self.brotli_quality)
+            headers['Content-Encoding'] = self.encoding
+            headers.add_vary_header('Accept-Encoding')
+            if more_body:
+                # Streamed: the compressed length is unknown up front
+                del headers['Content-Length']
+                await self._send(start)
+                await self._send_chunk(self.compressor.compress(body), more_body=True)
+            else:
+                compressed = self.compressor.compress(body) + self.compressor.finish()
+                headers['Content-Length'] = str(len(compressed))
+                await self._send(start)
+                await self._send({'type': 'http.response.body', 'body': compressed})
+            return
+
+        if self.passthrough or self.compressor is None:
+            await self._send(message)
+            return
+
+        if more_body:
+            await self._send_chunk(self.compressor.compress(body), more_body=True)
+        else:
+            await self._send({'type': 'http.response.body', 'body': self.compressor.compress(body) + self.compressor.finish()})
+
+    async def _send_chunk(self, data: bytes, more_body: bool) -> None:
+        # The compressor buffers small writes; skip empty chunks until it emits output
+        if data or not more_body:
+            await self._send({'type': 'http.response.body', 'body': data, 'more_body': more_body})
@@ -0,0 +1,204 @@
+import argparse
+import hashlib
+import os
+import random
+import re
+import struct
+from typing import List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import delete, func, insert, select, tuple_, union_all, update
+from sqlalchemy.orm import Session
+
+from models import LshBucket, ResumeVersion
+
+# Word shingles: long enough that unrelated resumes rarely share them
+SHINGLE_SIZE = 5
+NUM_PERMUTATIONS = 128
+# 16 bands of 8 rows put the LSH candidate threshold around 0.7 Jaccard
+LSH_BANDS = 16
+LSH_ROWS = NUM_PERMUTATIONS // LSH_BANDS
+DUPLICATE_THRESHOLD = float(os.getenv('DUPLICATE_THRESHOLD', 0.8))
+# Rows read from each matched bucket; boilerplate can put many versions in one,
+# so this bounds a lookup to LSH_BANDS * MAX_BUCKET_ROWS index entries
+MAX_BUCKET_ROWS = 200
+MAX_CANDIDATES = 1000
+DEDUP_BATCH_SIZE = 500
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_rng = random.Random(20240101)  # fixed: stored signatures must stay comparable
+_PERMUTATIONS = [
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+    for _ in range(NUM_PERMUTATIONS)
+]
+_SIGNATURE_FORMAT = f'<{NUM_PERMUTATIONS}Q'
+_WORD_RE = re.compile(r'\w+')
+
+Signature = Tuple[int, ...]
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> Set[str]:
+    words = _WORD_RE.findall(text.lower())
+    if len(words) <= size:
+        return {' '.join(words)} if words else set()
+    return {' '.join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def minhash(text: str) -> Optional[Signature]:
+    """MinHash signature of the text's word shingles; None for empty text."""
+    hashes = [
+        int.from_bytes(hashlib.blake2b(shingle.encode(), digest_size=8).digest(), 'little') % _MERSENNE_PRIME
+        for shingle in shingles(text)
+    ]
+    if not hashes:
+        return None
+    return tuple(min((a * value + b) % _MERSENNE_PRIME for value in hashes) for a, b in _PERMUTATIONS)
+
+
+def pack_signature(signature: Signature) -> bytes:
+    return struct.pack(_SIGNATURE_FORMAT, *signature)
+
+
+def unpack_signature(data: bytes) -> Signature:
+    return struct.unpack(_SIGNATURE_FORMAT, data)
+
+
+def similarity(first: Sequence[int], second: Sequence[int]) -> float:
+    """Estimated Jaccard similarity: the fraction of matching minimums."""
+    return sum(a == b for a, b in zip(first, second)) / NUM_PERMUTATIONS
+
+
+def band_keys(signature: Signature) -> List[str]:
+    keys = []
+    for band in range(LSH_BANDS):
+        rows = signature[band * LSH_ROWS:(band + 1) * LSH_ROWS]
+        digest = hashlib.blake2b(struct.pack(f'<{LSH_ROWS}Q', *rows), digest_size=8).hexdigest()
+        keys.append(f'{band:02d}:{digest}')
+    return keys
+
+
+def find_similar(db: Session, signature: Signature, threshold: float = DUPLICATE_THRESHOLD,
+                 exclude_id: Optional[str] = None, limit: int = 10) -> List[Tuple[str, float]]:
+    """Indexed versions whose estimated similarity reaches ``threshold``, best first.
+
+    Only versions sharing at least one LSH bucket are compared, so the cost
+    depends on the number of near matches rather than the corpus size.
+    """
+    per_bucket = []
+    for key in band_keys(signature):
+        rows = select(LshBucket.version_id).where(LshBucket.bucket == key)
+        if exclude_id is not None:
+            rows = rows.where(LshBucket.version_id != exclude_id)
+        # Wrapped so each LIMIT stays inside its own UNION member (SQLite requires it)
+        bucket = rows.order_by(LshBucket.version_id).limit(MAX_BUCKET_ROWS).subquery()
+        per_bucket.append(select(bucket.c.version_id))
+    hits = union_all(*per_bucket).subquery()
+    query = (
+        select(hits.c.version_id)
+        .group_by(hits.c.version_id)
+        .order_by(func.count().desc())
+        .limit(MAX_CANDIDATES)
+    )
+    candidate_ids = db.execute(query).scalars().all()
+    if not candidate_ids:
+        return []
+
+    rows = db.execute(
+        select(ResumeVersion.id, ResumeVersion.created_at, ResumeVersion.minhash)
+        .where(ResumeVersion.id.in_(candidate_ids))
+    ).all()
+    matches = []
+    for row in rows:
+        score = similarity(signature, unpack_signature(row.minhash))
+        if score >= threshold:
+            matches.append((score, row.created_at, row.id))
+    # Ties go to the oldest version, which is the original of a set of copies
+    matches.sort(key=lambda match: (-match[0], match[1] is None, match[1], match[2]))
+    return [(version_id, score) for score, _, version_id in matches[:limit]]
+
+
+def find_identical(db: Session, text: str, matches: List[Tuple[str, float]],
+                   ruleset_version: int) -> Optional[ResumeVersion]:
+    """A version with exactly this content, already scored by ``ruleset_version``."""
+    exact_ids = [version_id for version_id, score in matches if score == 1.0]
+    if not exact_ids:
+        return None
+    return db.execute(
+        select(ResumeVersion)
+        .where(ResumeVersion.id.in_(exact_ids))
+        .where(ResumeVersion.content == text)
+        .where(ResumeVersion.ruleset_version == ruleset_version)
+        .limit(1)
+    ).scalar_one_or_none()
+
+
+def index_version(db: Session, version: ResumeVersion, signature: Signature) -> None:
+    """Store a (flushed) version's signature and LSH buckets."""
+    version.minhash = pack_signature(signature)
+    db.execute(insert(LshBucket), [{'bucket': key, 'version_id': version.id} for key in band_keys(signature)])
+
+
+def remove_version(db: Session, version: ResumeVersion) -> None:
+    # Also done by ON DELETE CASCADE / SET NULL where foreign keys are enforced
+    db.execute(delete(LshBucket).where(LshBucket.version_id == version.id))
+    db.execute(update(ResumeVersion).where(ResumeVersion.duplicate_of == version.id).values(duplicate_of=None))
+
+
+def backfill(session_factory, batch_size: int = DEDUP_BATCH_SIZE,
+             threshold: float = DUPLICATE_THRESHOLD) -> Tuple[int, int]:
+    """Index versions without a signature, oldest first, flagging duplicates.
+
+    Pages through with a (created_at, id) keyset so each batch is a short
+    query and transaction. Returns (versions indexed, duplicates flagged).
+    """
+    db = session_factory()
+    indexed = flagged = 0
+    last = None
+    try:
+        while True:
+            query = (
+                select(ResumeVersion.id, ResumeVersion.created_at, ResumeVersion.content)
+                .where(ResumeVersion.minhash.is_(None))
+                .order_by(ResumeVersion.created_at, ResumeVersion.id)
+                .limit(batch_size)
+            )
+            if last is not None:
+                query = query.where(tuple_(ResumeVersion.created_at, ResumeVersion.id) > last)
+            batch = db.execute(query).all()
+            if not batch:
+                break
+            for version_id, _, content in batch:
+                signature = minhash(content)
+                if signature is None:
+                    continue
+                # Earlier versions of this batch were flushed, so they are candidates too
+                matches = find_similar(db, signature, threshold, exclude_id=version_id, limit=1)
+                version = db.get(ResumeVersion, version_id)
+                if matches and version.duplicate_of is None:
+                    version.duplicate_of = matches[0][0]
+                    flagged += 1
+                index_version(db, version, signature)
+                db.flush()
+                indexed += 1
+            db.commit()
+            db.expunge_all()
+            last = (batch[-1].created_at, batch[-1].id)
+    finally:
+        db.close()
+    return indexed, flagged
+
+
+def main(argv=None) -> None:
+    from database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Build the near-duplicate index for stored versions")
+    parser.add_argument('--batch-size', type=int, default=DEDUP_BATCH_SIZE)
+    parser.add_argument('--threshold', type=float, default=DUPLICATE_THRESHOLD,
+                        help="Estimated Jaccard similarity at which a version is flagged as a duplicate")
+    args = parser.parse_args(argv)
+
+    indexed, flagged = backfill(SessionLocal, args.batch_size, args.threshold)
+    print(f"Indexed {indexed} versions, flagged {flagged} duplicates")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+import argparse
+import json
+import os
+import sys
+import zipfile
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from database import SessionLocal
+from extractors import extension_for
+from models import ResumeVersion
+
+# Rows fetched per round trip from the server-side cursor
+EXPORT_BATCH_SIZE = int(os.getenv('EXPORT_BATCH_SIZE', 500))
+# Bytes read from disk per chunk when copying uploaded files into the archive
+EXPORT_CHUNK_SIZE = int(os.getenv('EXPORT_CHUNK_SIZE', 64 * 1024))
+
+EXPORT_COLUMNS = (
+    ResumeVersion.id,
+    ResumeVersion.user_id,
+    ResumeVersion.version_name,
+    ResumeVersion.score,
+    ResumeVersion.created_at,
+    ResumeVersion.updated_at,
+    ResumeVersion.file_original_name,
+    ResumeVersion.file_size,
+    ResumeVersion.file_mime_type,
+    ResumeVersion.content,
+)
+
+
+def _versions_query(columns, user_id: Optional[str] = None):
+    query = select(*columns).order_by(ResumeVersion.user_id, ResumeVersion.created_at)
+    if user_id is not None:
+        query = query.where(ResumeVersion.user_id == user_id)
+    # yield_per turns on a server-side cursor (stream_results) so rows are
+    # fetched in batches instead of being materialized all at once
+    return query.execution_options(yield_per=EXPORT_BATCH_SIZE)
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def version_to_ndjson(row) -> bytes:
+    return json.dumps(dict(row._mapping), default=_json_default, ensure_ascii=False).encode('utf-8') + b'\n'
+
+
+def iter_version_rows(db: Session, user_id: Optional[str] = None) -> Iterator:
+    yield from db.execute(_versions_query(EXPORT_COLUMNS, user_id))
+
+
+def iter_ndjson(db: Session, user_id: Optional[str] = None) -> Iterator[bytes]:
+    for row in iter_version_rows(db, user_id):
+        yield version_to_ndjson(row)
+
+
+class _ZipStream:
+    """Write-only sink for ZipFile that hands written bytes back to a generator.
+
+    It deliberately has no seek/tell so ZipFile falls back to streaming mode
+    (data descriptors after each member) and never rewinds the output.
+    """
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data) -> int:
+        if data:
+            self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _archive_name(row) -> str:
+    return f"files/{row.user_id}/{row.id}{extension_for(row.file_mime_type)}"
+
+
+def iter_export_zip(db: Session, user_id: Optional[str] = None) -> Iterator[bytes]:
+    stream = _ZipStream()
+    with zipfile.ZipFile(stream, mode='w', compression=zipfile.ZIP_DEFLATED) as archive:
+        # ZipFile only allows one open member at a time, so versions.ndjson is
+        # written in a first pass and the original files in a second one.
+        with archive.open('versions.ndjson', mode='w', force_zip64=True) as member:
+            for row in iter_version_rows(db, user_id):
+                member.write(version_to_ndjson(row))
+                yield stream.drain()
+
+        file_columns = (ResumeVersion.id, ResumeVersion.user_id, ResumeVersion.file_path, ResumeVersion.file_mime_type)
+        file_query = _versions_query(file_columns, user_id)
+        for row in db.execute(file_query.where(ResumeVersion.file_path.isnot(None))):
+            path = Path(row.file_path)
+            if not path.is_file():
+                continue
+            # PDFs and DOCX files are already compressed, deflating them again only costs CPU
+            info = zipfile.ZipInfo(_archive_name(row), date_time=datetime.fromtimestamp(path.stat().st_mtime).timetuple()[:6])
+            info.compress_type = zipfile.ZIP_STORED
+            with open(path, 'rb') as source, archive.open(info, mode='w', force_zip64=True) as member:
+                while True:
+                    data = source.read(EXPORT_CHUNK_SIZE)
+                    if not data:
+                        break
+                    member.write(data)
+                    yield stream.drain()
+            yield stream.drain()
+    yield stream.drain()
+
+
+def stream_export(user_id: Optional[str] = None, fmt: str = 'zip') -> Iterator[bytes]:
+    # Streaming responses outlive request-scoped dependencies, so the export
+    # owns its session for as long as the generator is being consumed.
+    db = SessionLocal()
+    try:
+        if fmt == 'ndjson':
+            yield from iter_ndjson(db, user_id)
+        else:
+            for chunk in iter_export_zip(db, user_id):
+                if chunk:
+                    yield chunk
+    finally:
+        db.close()
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Export resume versions as NDJSON or a zip archive")
+    parser.add_argument('--user-id', help="Only export versions of this user (default: all users)")
+    parser.add_argument('--format', choices=('zip', 'ndjson'), default='zip')
+    parser.add_argument('--output', '-o', help="Output file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    output = open(args.output, 'wb') if args.output else sys.stdout.buffer
+    try:
+        for chunk in stream_export(args.user_id, args.format):
+            output.write(chunk)
+    finally:
+        if args.output:
+            output.close()
+
+
+if __name__ == "__main__":
+    main()
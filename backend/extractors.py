@@ -0,0 +1,160 @@
+import codecs
+import hashlib
+import logging
+import os
+import threading
+import time
+import zipfile
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import BinaryIO, Callable, Dict, Optional
+
+import docx
+import fitz
+from docx.table import Table
+from docx.text.paragraph import Paragraph
+
+logger = logging.getLogger(__name__)
+
+PDF = "application/pdf"
+DOCX = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+TXT = "text/plain"
+
+CHUNK_SIZE = 64 * 1024
+# Bytes inspected when deciding whether an upload is plain text
+TEXT_SNIFF_SIZE = 8 * 1024
+EXTRACTION_CACHE_SIZE = int(os.getenv('EXTRACTION_CACHE_SIZE', os.getenv('CACHE_SIZE', 100)))
+
+
+@dataclass
+class Extractor:
+    mime_type: str
+    extension: str
+    extract: Callable[[BinaryIO], str]
+
+
+EXTRACTORS: Dict[str, Extractor] = {}
+
+
+def register_extractor(mime_type: str, extension: str):
+    def decorator(func: Callable[[BinaryIO], str]) -> Callable[[BinaryIO], str]:
+        EXTRACTORS[mime_type] = Extractor(mime_type, extension, func)
+        return func
+    return decorator
+
+
+def _is_docx(source: BinaryIO) -> bool:
+    try:
+        with zipfile.ZipFile(source) as archive:
+            return 'word/document.xml' in archive.namelist()
+    except zipfile.BadZipFile:
+        return False
+
+
+def _is_text(head: bytes) -> bool:
+    if b'\x00' in head:
+        return False
+    try:
+        # final=False tolerates a multi-byte character cut off at the end
+        codecs.getincrementaldecoder('utf-8-sig')().decode(head, final=False)
+    except UnicodeDecodeError:
+        return False
+    return True
+
+
+def detect_mime_type(source: BinaryIO) -> Optional[str]:
+    """Identify an upload from its magic bytes; the filename is not trusted."""
+    head = source.read(TEXT_SNIFF_SIZE)
+    source.seek(0)
+    try:
+        # The PDF header may be preceded by junk within the first 1KB
+        if b'%PDF-' in head[:1024]:
+            return PDF
+        if head.startswith(b'PK\x03\x04'):
+            return DOCX if _is_docx(source) else None
+        if head and _is_text(head):
+            return TXT
+        return None
+    finally:
+        source.seek(0)
+
+
+@register_extractor(PDF, '.pdf')
+def extract_pdf(source: BinaryIO) -> str:
+    with fitz.open(stream=source.read(), filetype="pdf") as doc:
+        return ''.join(page.get_text() for page in doc)
+
+
+@register_extractor(DOCX, '.docx')
+def extract_docx(source: BinaryIO) -> str:
+    document = docx.Document(source)
+    lines = []
+    # Walk the body in order so tables stay under the heading they belong to
+    for child in document.element.body.iterchildren():
+        tag = child.tag.rsplit('}', 1)[-1]
+        if tag == 'p':
+            lines.append(Paragraph(child, document).text)
+        elif tag == 'tbl':
+            for row in Table(child, document).rows:
+                seen = set()
+                cells = []
+                for cell in row.cells:
+                    # Merged cells are reported once per grid column
+                    if id(cell._tc) in seen:
+                        continue
+                    seen.add(id(cell._tc))
+                    cells.append(cell.text.strip())
+                lines.append('\t'.join(cells))
+    return '\n'.join(lines)
+
+
+@register_extractor(TXT, '.txt')
+def extract_txt(source: BinaryIO) -> str:
+    decoder = codecs.getincrementaldecoder('utf-8-sig')(errors='replace')
+    parts = []
+    while True:
+        chunk = source.read(CHUNK_SIZE)
+        if not chunk:
+            break
+        parts.append(decoder.decode(chunk))
+    parts.append(decoder.decode(b'', final=True))
+    return ''.join(parts).replace('\r\n', '\n').replace('\r', '\n')
+
+
+def extension_for(mime_type: Optional[str]) -> str:
+    extractor = EXTRACTORS.get(mime_type)
+    return extractor.extension if extractor else '.pdf'
+
+
+_cache: "OrderedDict[tuple, str]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _digest(source: BinaryIO) -> str:
+    digest = hashlib.sha256()
+    while True:
+        chunk = source.read(CHUNK_SIZE)
+        if not chunk:
+            break
+        digest.update(chunk)
+    source.seek(0)
+    return digest.hexdigest()
+
+
+def extract_text(source: BinaryIO, mime_type: str, digest: Optional[str] = None) -> str:
+    """Extract text with the registered extractor, caching results by content hash."""
+    key = (mime_type, digest or _digest(source))
+    with _cache_lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+
+    started = time.perf_counter()
+    text = EXTRACTORS[mime_type].extract(source)
+    logger.debug("Extracted %d characters from %s in %.1f ms", len(text), mime_type, (time.perf_counter() - started) * 1000)
+
+    with _cache_lock:
+        _cache[key] = text
+        if len(_cache) > EXTRACTION_CACHE_SIZE:
+            _cache.popitem(last=False)
+    return text
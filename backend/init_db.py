@@ -17,6 +17,10 @@ def init_db():
     # Create all tables
     Base.metadata.create_all(bind=engine)
     
+    # The additional indexes below are PostgreSQL-specific
+    if engine.dialect.name != "postgresql":
+        return
+    
     # Create additional indexes
     with engine.connect() as conn:
         # Create GIN index for array columns in resume_versions
@@ -0,0 +1,298 @@
+import logging
+import os
+import re
+import subprocess
+import sys
+import threading
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field, replace
+from functools import lru_cache
+from typing import Dict, List, Optional, Pattern
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LANGUAGE = os.getenv('DEFAULT_LANGUAGE', 'en')
+# Returned for text mostly in a script none of the registered languages use
+UNKNOWN_LANGUAGE = 'xx'
+# Pipelines kept loaded at once; a small spaCy model is ~50MB in memory
+SPACY_MODEL_POOL_SIZE = int(os.getenv('SPACY_MODEL_POOL_SIZE', 2))
+# Only ever used when warming DEFAULT_LANGUAGE at startup; requests never download
+SPACY_AUTO_DOWNLOAD = os.getenv('SPACY_AUTO_DOWNLOAD', 'true').lower() == 'true'
+
+# Language identification only looks at the start of the text
+DETECTION_SAMPLE_SIZE = 4000
+DETECTION_MIN_WORDS = 20
+# Another language must have this many stopword hits, and DETECTION_MARGIN
+# times the default language's, to be chosen. Terse resumes (bullets, skill
+# lists) have few stopwords, so anything less stays DEFAULT_LANGUAGE
+DETECTION_MIN_HITS = 3
+DETECTION_MARGIN = 2
+# Share of letters outside the Latin script above which the text is UNKNOWN_LANGUAGE
+DETECTION_MAX_NON_LATIN = 0.5
+_LATIN_MAX_CODEPOINT = 0x24F
+
+_WORD_RE = re.compile(r'[^\W\d_]+')
+
+
+@dataclass
+class LanguageConfig:
+    code: str
+    name: str
+    model: Optional[str]  # spaCy pipeline; None means regex-only analysis
+    stopwords: frozenset
+    action_verbs: List[str]
+    education_keywords: List[str]
+    # Section name -> regex alternation of header words, added to the English ones
+    section_headers: Dict[str, str] = field(default_factory=dict)
+    # Dependency labels the model's parser uses for passive constructions
+    passive_deps: frozenset = frozenset()
+
+
+LANGUAGES: Dict[str, LanguageConfig] = {}
+
+
+def register_language(config: LanguageConfig) -> LanguageConfig:
+    LANGUAGES[config.code] = config
+    section_patterns.cache_clear()
+    return config
+
+
+def get_language(code: str) -> LanguageConfig:
+    return LANGUAGES.get(code, LANGUAGES[UNKNOWN_LANGUAGE])
+
+
+@lru_cache(maxsize=None)
+def section_patterns(code: str) -> Dict[str, Pattern]:
+    # English headers are always recognized; non-English resumes often mix them in
+    headers = ENGLISH.section_headers
+    extra = get_language(code).section_headers
+    return {
+        section: re.compile(f"(?i)({alternation}|{extra[section]})" if extra.get(section, alternation) != alternation
+                            else f"(?i)({alternation})")
+        for section, alternation in headers.items()
+    }
+
+
+ENGLISH = register_language(LanguageConfig(
+    code='en',
+    name='English',
+    model='en_core_web_sm',
+    stopwords=frozenset('the and of to in with for on a an is as at by from was were be my our i'.split()),
+    action_verbs=["developed", "created", "implemented", "managed", "led", "increased",
+                  "improved", "achieved", "delivered", "optimized", "designed", "architected",
+                  "launched", "initiated", "coordinated", "facilitated", "established",
+                  "enhanced", "streamlined", "revolutionized", "pioneered", "spearheaded"],
+    education_keywords=['bachelor', 'master', 'phd', 'degree', 'university', 'college', 'gpa'],
+    section_headers={
+        'education': 'education|academic|qualification',
+        'experience': 'experience|work|employment|professional',
+        'skills': 'skills|technical|competencies',
+        'projects': 'projects|portfolio',
+        'contact': 'contact|email|phone|address',
+        'summary': 'summary|profile|objective',
+        'certifications': 'certifications|certificates|accreditations',
+        'languages': 'languages|language proficiency',
+    },
+    passive_deps=frozenset({'auxpass'}),
+))
+
+register_language(LanguageConfig(
+    code='es',
+    name='Spanish',
+    model='es_core_news_sm',
+    stopwords=frozenset('de la el en y los las del con para por una un se que al como su'.split()),
+    action_verbs=["desarrollé", "desarrollo", "creé", "implementé", "gestioné", "lideré", "dirigí",
+                  "aumenté", "mejoré", "logré", "optimicé", "diseñé", "lancé", "coordiné",
+                  "establecí", "reduje", "desarrollar", "gestionar", "liderar", "diseñar"],
+    education_keywords=['licenciatura', 'grado', 'máster', 'maestría', 'doctorado', 'universidad', 'título'],
+    section_headers={
+        'education': 'educación|formación|estudios',
+        'experience': 'experiencia|trayectoria',
+        'skills': 'habilidades|competencias|aptitudes',
+        'projects': 'proyectos',
+        'contact': 'contacto|correo|teléfono|dirección',
+        'summary': 'resumen|perfil|objetivo',
+        'certifications': 'certificaciones|certificados',
+        'languages': 'idiomas',
+    },
+    # Universal Dependencies labels
+    passive_deps=frozenset({'aux:pass', 'expl:pass'}),
+))
+
+register_language(LanguageConfig(
+    code='fr',
+    name='French',
+    model='fr_core_news_sm',
+    stopwords=frozenset('le la les de des et en du pour avec dans une un au aux sur par est'.split()),
+    action_verbs=["développé", "créé", "géré", "dirigé", "piloté", "augmenté", "amélioré",
+                  "réalisé", "livré", "optimisé", "conçu", "lancé", "coordonné", "encadré",
+                  "réduit", "développer", "gérer", "piloter", "concevoir"],
+    education_keywords=['licence', 'master', 'doctorat', 'diplôme', 'université', 'école', 'baccalauréat'],
+    section_headers={
+        'education': 'formation|études|diplômes',
+        'experience': 'expérience|parcours',
+        'skills': 'compétences|aptitudes',
+        'projects': 'projets',
+        'contact': 'coordonnées|courriel|téléphone|adresse',
+        'summary': 'résumé|profil|objectif',
+        'certifications': 'certifications|certificats',
+        'languages': 'langues',
+    },
+    # Universal Dependencies labels
+    passive_deps=frozenset({'aux:pass', 'expl:pass'}),
+))
+
+register_language(LanguageConfig(
+    code='de',
+    name='German',
+    # The German pipeline's TIGER labels have no passive relation, and the
+    # parse would only be used for tokens; regex-only analysis gives the same result
+    model=None,
+    stopwords=frozenset('der die das und in mit für von zu den im auf ist ein eine als bei des'.split()),
+    action_verbs=["entwickelt", "erstellt", "implementiert", "geleitet", "geführt", "gesteigert",
+                  "verbessert", "erreicht", "optimiert", "entworfen", "eingeführt", "koordiniert",
+                  "aufgebaut", "reduziert", "verantwortet", "betreut"],
+    education_keywords=['bachelor', 'master', 'diplom', 'promotion', 'universität', 'hochschule', 'abschluss'],
+    section_headers={
+        'education': 'bildung|studium',
+        'experience': 'erfahrung|werdegang',
+        'skills': 'kenntnisse|fähigkeiten|kompetenzen',
+        'projects': 'projekte',
+        'contact': 'kontakt|telefon|adresse',
+        'summary': 'profil|zusammenfassung|über mich',
+        'certifications': 'zertifikate|zertifizierungen',
+        'languages': 'sprachen|sprachkenntnisse',
+    },
+))
+
+register_language(LanguageConfig(
+    code='pt',
+    name='Portuguese',
+    model='pt_core_news_sm',
+    stopwords=frozenset('de da do em e os as para com uma um no na por dos das ao'.split()),
+    action_verbs=["desenvolvi", "criei", "implementei", "gerenciei", "liderei", "aumentei",
+                  "melhorei", "alcancei", "entreguei", "otimizei", "projetei", "lancei",
+                  "coordenei", "estabeleci", "reduzi"],
+    education_keywords=['bacharelado', 'licenciatura', 'mestrado', 'doutorado', 'universidade', 'faculdade', 'graduação'],
+    section_headers={
+        'education': 'formação|educação|escolaridade',
+        'experience': 'experiência|histórico profissional',
+        'skills': 'habilidades|competências',
+        'projects': 'projetos',
+        'contact': 'contato|telefone|endereço',
+        'summary': 'resumo|perfil|objetivo',
+        'certifications': 'certificações|certificados',
+        'languages': 'idiomas',
+    },
+    # Universal Dependencies labels
+    passive_deps=frozenset({'aux:pass', 'expl:pass'}),
+))
+
+# Unrecognized languages: English keyword sets (skills and tooling names are
+# mostly English anyway) without paying for a pipeline that can't parse them
+register_language(replace(ENGLISH, code=UNKNOWN_LANGUAGE, name='Unknown', model=None, stopwords=frozenset()))
+
+
+def detect_language(text: str) -> str:
+    """Guess the language from stopword frequencies in a sample of the text.
+
+    Falls back to DEFAULT_LANGUAGE unless another registered language clearly
+    wins; text mostly in a non-Latin script is UNKNOWN_LANGUAGE.
+    """
+    words = _WORD_RE.findall(text[:DETECTION_SAMPLE_SIZE].lower())
+    if len(words) < DETECTION_MIN_WORDS:
+        return DEFAULT_LANGUAGE
+    letters = ''.join(words)
+    non_latin = sum(1 for char in letters if ord(char) > _LATIN_MAX_CODEPOINT)
+    if non_latin > len(letters) * DETECTION_MAX_NON_LATIN:
+        return UNKNOWN_LANGUAGE
+
+    counts = Counter(words)
+    hits = {code: sum(counts[word] for word in config.stopwords) for code, config in LANGUAGES.items()}
+    best = max(hits, key=hits.get)
+    default_hits = hits.get(DEFAULT_LANGUAGE, 0)
+    if best != DEFAULT_LANGUAGE and hits[best] >= max(DETECTION_MIN_HITS, default_hits * DETECTION_MARGIN):
+        return best
+    return DEFAULT_LANGUAGE
+
+
+class ModelPool:
+    """Per-language spaCy pipelines, loaded on first use and LRU-evicted.
+
+    Languages whose pipeline isn't installed resolve to None and are
+    remembered, so callers fall back to regex-only analysis without retrying
+    the load on every request.
+    """
+
+    def __init__(self, maxsize: int = SPACY_MODEL_POOL_SIZE, loader=None):
+        self.maxsize = maxsize
+        self.loader = loader or self._spacy_load
+        self.loads = 0
+        self.evictions = 0
+        self._models: "OrderedDict[str, object]" = OrderedDict()
+        self._unavailable = set()
+        self._lock = threading.Lock()
+        self._load_locks: Dict[str, threading.Lock] = {}
+
+    @staticmethod
+    def _spacy_load(model: str):
+        import spacy
+        # NER isn't used by any analyzer; the parser provides sentences and voice
+        return spacy.load(model, exclude=['ner'])
+
+    def _load(self, config: LanguageConfig, download: bool):
+        try:
+            return self.loader(config.model)
+        except OSError:
+            if not download:
+                raise
+            logger.info("Downloading spaCy pipeline %s", config.model)
+            subprocess.run([sys.executable, "-m", "spacy", "download", config.model], check=True)
+            return self.loader(config.model)
+
+    def get(self, code: str, download: bool = False):
+        """The language's pipeline, or None for regex-only analysis.
+
+        ``download`` installs a missing pipeline with pip; it blocks for as
+        long as that takes, so it is meant for startup, not request paths.
+        """
+        config = get_language(code)
+        if config.model is None:
+            return None
+        with self._lock:
+            if code in self._models:
+                self._models.move_to_end(code)
+                return self._models[code]
+            if code in self._unavailable:
+                return None
+            load_lock = self._load_locks.setdefault(code, threading.Lock())
+
+        # Loading takes seconds; other languages stay usable meanwhile and
+        # concurrent requests for this one wait for a single load
+        with load_lock:
+            with self._lock:
+                if code in self._models:
+                    return self._models[code]
+            try:
+                model = self._load(config, download)
+            except Exception as e:
+                logger.warning("spaCy pipeline %s unavailable, using regex-only analysis: %s", config.model, e)
+                with self._lock:
+                    self._unavailable.add(code)
+                return None
+            with self._lock:
+                self.loads += 1
+                self._models[code] = model
+                while len(self._models) > self.maxsize:
+                    self._models.popitem(last=False)
+                    self.evictions += 1
+            return model
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'loaded': list(self._models),
+                'unavailable': sorted(self._unavailable),
+                'loads': self.loads,
+                'evictions': self.evictions,
+            }
@@ -1,30 +1,57 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException, Depends
+from fastapi import FastAPI, UploadFile, File, HTTPException, Depends, BackgroundTasks, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-import fitz
-import spacy
-from typing import Dict, List, Optional, Set
+from fastapi.responses import StreamingResponse
+try:
+    import orjson  # noqa: F401  (optional, enables the faster serializer)
+    from fastapi.responses import ORJSONResponse as AnalysisResponse
+except ImportError:
+    from fastapi.responses import JSONResponse as AnalysisResponse
+from typing import Any, Dict, List, Literal, Optional, Set
 import json
 from functools import lru_cache
 import asyncio
+import anyio
 import os
+import threading
 import re
 from dotenv import load_dotenv
 from pydantic import BaseModel
 from collections import defaultdict
-from datetime import datetime, timedelta
+from datetime import datetime
 import uuid
+from sqlalchemy import func
 from sqlalchemy.orm import Session
-import shutil
-from pathlib import Path
 import random
 
-from database import get_db
+from analytics import get_summary as get_score_summary, record_version as record_analytics, remove_version as remove_analytics
+from compression import CompressionMiddleware
+from database import get_db, engine, DB_POOL_SIZE, DB_MAX_OVERFLOW
+from dedup import DUPLICATE_THRESHOLD, find_identical, find_similar, index_version, minhash, remove_version as remove_from_index, unpack_signature
+from http_cache import cache_headers, is_not_modified, make_etag, not_modified
+from languages import DEFAULT_LANGUAGE, SPACY_AUTO_DOWNLOAD, ModelPool, detect_language, get_language, section_patterns
 from models import User, ResumeVersion
+from export import stream_export
+from extractors import EXTRACTORS, detect_mime_type, extract_text
+from ratelimit import MAX_CONCURRENT_ANALYSES, AdmissionController, RateLimitMiddleware, build_rate_limiter
+from section_cache import SectionCache, section_key
+from seed_data import TEST_USER_PREFIX, seed_user, clear_test_data as clear_seeded_users
+from storage import UPLOAD_DIR, BlobStore, acquire_blob, release_blob, remove_legacy_file, garbage_collector_loop
 
 load_dotenv()
 
 app = FastAPI()
 
+# Rate limiting for the expensive upload endpoints.
+# Added before CORS so rejections still carry CORS headers.
+app.add_middleware(
+    RateLimitMiddleware,
+    paths=["/analyze", "/save-version"],
+    limiter=build_rate_limiter(engine),
+)
+
+# Concurrency cap for analyses, taken once the upload has been received
+analysis_admission = AdmissionController(MAX_CONCURRENT_ANALYSES)
+
 # Enable CORS
 app.add_middleware(
     CORSMiddleware,
@@ -34,17 +61,32 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Create uploads directory if it doesn't exist
-UPLOAD_DIR = Path("uploads")
-UPLOAD_DIR.mkdir(exist_ok=True)
+# gzip/brotli for responses above COMPRESSION_MINIMUM_SIZE
+app.add_middleware(CompressionMiddleware)
 
-# Load spaCy model
-try:
-    nlp = spacy.load("en_core_web_sm")
-except:
-    import subprocess
-    subprocess.run(["python", "-m", "spacy", "download", "en_core_web_sm"])
-    nlp = spacy.load("en_core_web_sm")
+# Content-addressed store for uploaded files (creates UPLOAD_DIR if needed)
+blob_store = BlobStore(UPLOAD_DIR)
+BLOB_GC_INTERVAL = int(os.getenv('BLOB_GC_INTERVAL', 3600))  # 0 disables the background collector
+
+@app.on_event("startup")
+async def start_blob_garbage_collector():
+    if BLOB_GC_INTERVAL > 0:
+        app.state.blob_gc_task = asyncio.create_task(garbage_collector_loop(blob_store, BLOB_GC_INTERVAL))
+
+@app.on_event("shutdown")
+async def stop_blob_garbage_collector():
+    task = getattr(app.state, 'blob_gc_task', None)
+    if task:
+        task.cancel()
+
+# spaCy pipelines per language, loaded on first use (see languages.py)
+model_pool = ModelPool()
+
+@app.on_event("startup")
+async def warm_default_pipeline():
+    # Most resumes are in the default language; load it (downloading it if
+    # SPACY_AUTO_DOWNLOAD allows) before the first request
+    await asyncio.to_thread(model_pool.get, DEFAULT_LANGUAGE, SPACY_AUTO_DOWNLOAD)
 
 class ResumeAnalysisError(Exception):
     pass
@@ -54,9 +96,9 @@ class ResumeSection(BaseModel):
     content: str
     score: float
     suggestions: List[str]
-    details: Dict[str, any] = {}
+    details: Dict[str, Any] = {}
 
-class ResumeVersion(BaseModel):
+class ResumeVersionSchema(BaseModel):
     id: str
     user_id: str
     content: str
@@ -108,38 +150,34 @@ ACHIEVEMENT_PATTERNS = {
     'cost': r'\$\d+(?:K|M|B)? savings|\$\d+(?:K|M|B)? reduction'
 }
 
+# Bump whenever section scoring rules change; invalidates cached section results
+RULESET_VERSION = 2
+
+# Per-section analysis results keyed by (section, industry, language, content hash, ruleset)
+section_cache = SectionCache(maxsize=int(os.getenv('SECTION_CACHE_SIZE', 1000)))
+
 # In-memory storage for demo (replace with database in production)
 resume_versions = {}
 
+# Compare results only change if either version is rewritten (e.g. rescored),
+# which changes the ETag, so clients may reuse them for a long time
+COMPARE_CACHE_MAX_AGE = int(os.getenv('COMPARE_CACHE_MAX_AGE', 7 * 24 * 3600))
+
 # Developer mode flag
 DEV_MODE = os.getenv("DEV_MODE", "false").lower() == "true"
 
-def validate_pdf(file: UploadFile) -> None:
-    if not file.filename.endswith('.pdf'):
-        raise HTTPException(status_code=400, detail="Only PDF files are supported")
+def validate_upload(file: UploadFile) -> str:
     if file.size > int(os.getenv('MAX_FILE_SIZE', 5 * 1024 * 1024)):  # Default 5MB limit
         raise HTTPException(status_code=400, detail="File too large")
+    # Detect the format from the content itself rather than the filename
+    mime_type = detect_mime_type(file.file)
+    if mime_type not in EXTRACTORS:
+        raise HTTPException(status_code=400, detail="Unsupported file type. Upload a PDF, DOCX or plain text file")
+    return mime_type
 
-def extract_text_from_pdf(file: UploadFile) -> str:
-    content = file.file.read()
-    doc = fitz.open(stream=content, filetype="pdf")
-    text = ""
-    for page in doc:
-        text += page.get_text()
-    return text
-
-def detect_sections(text: str) -> Dict[str, str]:
-    # Common section headers
-    section_patterns = {
-        'education': r'(?i)(education|academic|qualification)',
-        'experience': r'(?i)(experience|work|employment|professional)',
-        'skills': r'(?i)(skills|technical|competencies)',
-        'projects': r'(?i)(projects|portfolio)',
-        'contact': r'(?i)(contact|email|phone|address)',
-        'summary': r'(?i)(summary|profile|objective)',
-        'certifications': r'(?i)(certifications|certificates|accreditations)',
-        'languages': r'(?i)(languages|language proficiency)'
-    }
+def detect_sections(text: str, language: str = DEFAULT_LANGUAGE) -> Dict[str, str]:
+    # Common section headers, plus the language's own
+    patterns = section_patterns(language)
     
     sections = {}
     lines = text.split('\n')
@@ -153,8 +191,8 @@ def detect_sections(text: str) -> Dict[str, str]:
             
         # Check if line matches any section header
         found_section = False
-        for section, pattern in section_patterns.items():
-            if re.search(pattern, line):
+        for section, pattern in patterns.items():
+            if pattern.search(line):
                 if current_content:
                     sections[current_section] = '\n'.join(current_content)
                 current_section = section
@@ -243,23 +281,24 @@ def analyze_skills_section(content: str, industry: str = 'software_engineering')
         }
     )
 
-def analyze_experience_section(content: str) -> ResumeSection:
-    doc = nlp(content)
-    
-    # Action verbs analysis
-    action_verbs = ["developed", "created", "implemented", "managed", "led", "increased", 
-                   "improved", "achieved", "delivered", "optimized", "designed", "architected",
-                   "launched", "initiated", "coordinated", "facilitated", "established",
-                   "enhanced", "streamlined", "revolutionized", "pioneered", "spearheaded"]
-    
-    found_verbs = [token.text.lower() for token in doc if token.text.lower() in action_verbs]
+def analyze_experience_section(content: str, language: str = DEFAULT_LANGUAGE) -> ResumeSection:
+    config = get_language(language)
+    action_verbs = set(config.action_verbs)
+    nlp = model_pool.get(language)
+    
+    if nlp is not None:
+        doc = nlp(content)
+        found_verbs = [token.text.lower() for token in doc if token.text.lower() in action_verbs]
+        # Passive voice detection
+        passive_voice = [sent.text for sent in doc.sents if any(token.dep_ in config.passive_deps for token in sent)]
+    else:
+        # No pipeline for this language: regex tokens only, no parse-based checks
+        found_verbs = [word for word in re.findall(r'\w+', content.lower()) if word in action_verbs]
+        passive_voice = []
     
     # Analyze achievements
     achievements = analyze_achievements(content)
     
-    # Passive voice detection
-    passive_voice = [sent.text for sent in doc.sents if any(token.dep_ == "auxpass" for token in sent)]
-    
     # Calculate scores for different aspects
     verb_score = min(100, len(found_verbs) * 5)
     achievement_score = min(100, sum(len(achievements[metric]) for metric in achievements) * 10)
@@ -285,6 +324,7 @@ def analyze_experience_section(content: str) -> ResumeSection:
             'action_verbs': found_verbs,
             'achievements': achievements,
             'passive_voice': passive_voice,
+            'nlp': nlp is not None,
             'aspect_scores': {
                 'action_verbs': verb_score,
                 'achievements': achievement_score,
@@ -293,9 +333,9 @@ def analyze_experience_section(content: str) -> ResumeSection:
         }
     )
 
-def analyze_education_section(content: str) -> ResumeSection:
+def analyze_education_section(content: str, language: str = DEFAULT_LANGUAGE) -> ResumeSection:
     # Education keywords
-    education_keywords = ['bachelor', 'master', 'phd', 'degree', 'university', 'college', 'gpa']
+    education_keywords = get_language(language).education_keywords
     found_keywords = [keyword for keyword in education_keywords if keyword in content.lower()]
     
     # Date detection
@@ -389,14 +429,49 @@ def analyze_contact_section(content: str) -> ResumeSection:
         }
     )
 
+def analyze_general_section(name: str, content: str) -> ResumeSection:
+    word_count = len(content.split())
+    score = min(100, word_count * 2)
+    
+    suggestions = []
+    if word_count < 20:
+        suggestions.append(f"Expand your {name} section with more detail")
+    
+    return ResumeSection(
+        title=name.title(),
+        content=content,
+        score=score,
+        suggestions=suggestions,
+        details={'word_count': word_count}
+    )
+
+def analyze_section(name: str, content: str, industry: str, language: str = DEFAULT_LANGUAGE) -> ResumeSection:
+    if name == 'skills':
+        return analyze_skills_section(content, industry)
+    if name in ('experience', 'projects'):
+        return analyze_experience_section(content, language)
+    if name == 'education':
+        return analyze_education_section(content, language)
+    if name == 'contact':
+        return analyze_contact_section(content)
+    return analyze_general_section(name, content)
+
+def analyze_section_cached(name: str, content: str, industry: str, language: str = DEFAULT_LANGUAGE) -> ResumeSection:
+    # Unchanged sections of a new version reuse their earlier result
+    key = section_key(name, industry, language, content, RULESET_VERSION)
+    return section_cache.get_or_compute(key, lambda: analyze_section(name, content, industry, language))
+
 @lru_cache(maxsize=int(os.getenv('CACHE_SIZE', 100)))
 def analyze_resume(text: str) -> Dict:
-    # Detect industry
+    # Detect language and industry
+    language = detect_language(text)
     industry = detect_industry(text)
     
-    # Detect and analyze sections
-    sections = detect_sections(text)
-    section_analyses = {name: analyze_section(name, content, industry) for name, content in sections.items()}
+    # Detect and analyze sections, only running analyzers for changed sections
+    sections = detect_sections(text, language)
+    section_analyses = {
+        name: analyze_section_cached(name, content, industry, language) for name, content in sections.items()
+    }
     
     # Calculate overall score
     overall_score = sum(section.score for section in section_analyses.values()) / len(section_analyses)
@@ -419,6 +494,7 @@ def analyze_resume(text: str) -> Dict:
     return {
         "score": round(overall_score, 1),
         "industry": industry,
+        "language": language,
         "sections": {
             name: {
                 "score": section.score,
@@ -432,14 +508,45 @@ def analyze_resume(text: str) -> Dict:
         "weaknesses": weaknesses
     }
 
+ANALYSIS_FIELDS = {"score", "industry", "language", "sections", "suggestions", "strengths", "weaknesses"}
+
+def project_analysis(analysis: Dict, fields: Optional[Set[str]] = None, include_details: bool = True) -> Dict:
+    # Always builds new dicts: analysis is shared through analyze_resume's lru_cache
+    projected = {key: value for key, value in analysis.items() if fields is None or key in fields}
+    if not include_details and "sections" in projected:
+        projected["sections"] = {
+            name: {key: value for key, value in section.items() if key != "details"}
+            for name, section in projected["sections"].items()
+        }
+    return projected
+
+def parse_fields(fields: Optional[str]) -> Optional[Set[str]]:
+    if not fields:
+        return None
+    requested = {field.strip() for field in fields.split(",") if field.strip()}
+    unknown = requested - ANALYSIS_FIELDS
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    return requested
+
 @app.post("/analyze")
-async def analyze_resume_endpoint(file: UploadFile = File(...)):
+async def analyze_resume_endpoint(
+    file: UploadFile = File(...),
+    fields: Optional[str] = None,
+    include_details: bool = True,
+    _slot: None = Depends(analysis_admission.slot)
+):
     try:
-        validate_pdf(file)
-        text = await asyncio.to_thread(extract_text_from_pdf, file)
+        requested_fields = parse_fields(fields)
+        mime_type = validate_upload(file)
+        text = await asyncio.to_thread(extract_text, file.file, mime_type)
         if not text.strip():
-            raise ResumeAnalysisError("Could not extract text from PDF")
-        return await asyncio.to_thread(analyze_resume, text)
+            raise ResumeAnalysisError("Could not extract text from file")
+        analysis = await asyncio.to_thread(analyze_resume, text)
+        # Returned as a response object so FastAPI skips jsonable_encoder on the large dict
+        return AnalysisResponse(project_analysis(analysis, requested_fields, include_details))
+    except HTTPException:
+        raise
     except ResumeAnalysisError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -450,56 +557,131 @@ async def save_resume_version(
     file: UploadFile = File(...),
     user_id: str = None,
     version_name: str = None,
+    _slot: None = Depends(analysis_admission.slot),
     db: Session = Depends(get_db)
 ):
+    staged = None
     try:
-        validate_pdf(file)
+        mime_type = validate_upload(file)
         
-        # Save file to disk
-        file_path = UPLOAD_DIR / f"{uuid.uuid4()}.pdf"
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        # Stream the upload into the blob store's temp area while hashing it
+        staged = await asyncio.to_thread(blob_store.stage, file.file)
+        file.file.seek(0)
         
         # Extract and analyze text
-        text = await asyncio.to_thread(extract_text_from_pdf, file)
+        text = await asyncio.to_thread(extract_text, file.file, mime_type, staged.sha256)
         if not text.strip():
-            raise ResumeAnalysisError("Could not extract text from PDF")
+            raise ResumeAnalysisError("Could not extract text from file")
         
-        analysis = await asyncio.to_thread(analyze_resume, text)
+        # Near-duplicate lookup; an identical, already scored upload skips analysis
+        signature = await asyncio.to_thread(minhash, text)
+        matches = find_similar(db, signature) if signature else []
+        original = find_identical(db, text, matches, RULESET_VERSION)
+        if original is not None:
+            score, section_scores = original.score, dict(original.section_scores or {})
+        else:
+            analysis = await asyncio.to_thread(analyze_resume, text)
+            score = analysis["score"]
+            section_scores = {name: section["score"] for name, section in analysis["sections"].items()}
         
         # Get or create user
         user = db.query(User).filter(User.id == user_id).first()
         if not user:
-            user = User(id=user_id, email=f"{user_id}@example.com")
+            user = User(id=user_id, email=f"{user_id}@example.com", password_hash="")
             db.add(user)
             db.commit()
         
+        # Reference the blob; identical uploads share a single file
+        file_path = acquire_blob(db, blob_store, staged)
+        
         # Create version
         version = ResumeVersion(
             user_id=user.id,
             content=text,
-            score=analysis["score"],
+            score=score,
             version_name=version_name or f"Version {len(user.versions) + 1}",
-            file_path=str(file_path)
+            file_path=str(file_path),
+            file_hash=staged.sha256,
+            file_original_name=file.filename,
+            file_size=staged.size,
+            file_mime_type=mime_type,
+            section_scores=section_scores,
+            ruleset_version=RULESET_VERSION,
+            duplicate_of=matches[0][0] if matches else None
         )
         
         db.add(version)
+        db.flush()
+        if signature:
+            index_version(db, version, signature)
+        
+        # Keep the user's score summary current in the same transaction
+        record_analytics(db, version)
         db.commit()
         db.refresh(version)
         
-        return {"version_id": version.id, "score": version.score}
+        return {"version_id": version.id, "score": version.score, "duplicate_of": version.duplicate_of}
     except Exception as e:
-        if 'file_path' in locals():
-            file_path.unlink(missing_ok=True)
+        db.rollback()
+        if staged is not None:
+            blob_store.discard(staged)
+        if isinstance(e, HTTPException):
+            raise
+        if isinstance(e, ResumeAnalysisError):
+            raise HTTPException(status_code=400, detail=str(e))
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/versions/{user_id}")
-async def get_resume_versions(user_id: str, db: Session = Depends(get_db)):
+async def get_resume_versions(user_id: str, request: Request, response: Response, db: Session = Depends(get_db)):
+    # Validator from one aggregate over the user_id index: any insert, update
+    # or delete changes the count or the newest modification time. No
+    # Last-Modified: deleting an older version doesn't move that time, so
+    # If-Modified-Since would answer 304 with a stale list
+    modified = func.coalesce(ResumeVersion.updated_at, ResumeVersion.created_at)
+    count, last_modified = db.query(func.count(ResumeVersion.id), func.max(modified)).filter(
+        ResumeVersion.user_id == user_id
+    ).one()
+    headers = cache_headers(
+        make_etag("versions", user_id, count, last_modified.isoformat() if last_modified else ""),
+        None,
+        "private, no-cache"
+    )
+    if is_not_modified(request, headers["ETag"]):
+        return not_modified(headers)
+    
     versions = db.query(ResumeVersion).filter(ResumeVersion.user_id == user_id).all()
+    response.headers.update(headers)
     return sorted(versions, key=lambda x: x.created_at, reverse=True)
 
 @app.get("/compare/{version_id_1}/{version_id_2}")
-async def compare_versions(version_id_1: str, version_id_2: str, db: Session = Depends(get_db)):
+async def compare_versions(
+    version_id_1: str,
+    version_id_2: str,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db)
+):
+    # Check the validators before loading and re-parsing both versions
+    stamps = {
+        row.id: row.updated_at or row.created_at
+        for row in db.query(ResumeVersion.id, ResumeVersion.updated_at, ResumeVersion.created_at).filter(
+            ResumeVersion.id.in_([version_id_1, version_id_2])
+        )
+    }
+    if version_id_1 not in stamps or version_id_2 not in stamps:
+        raise HTTPException(status_code=404, detail="Version not found")
+    
+    last_modified = max(stamps.values())
+    headers = cache_headers(
+        # The comparison re-runs section detection, so a ruleset change alters it too
+        make_etag("compare", RULESET_VERSION, version_id_1, stamps[version_id_1], version_id_2, stamps[version_id_2]),
+        last_modified,
+        f"private, max-age={COMPARE_CACHE_MAX_AGE}"
+    )
+    if is_not_modified(request, headers["ETag"], last_modified):
+        return not_modified(headers)
+    response.headers.update(headers)
+    
     v1 = db.query(ResumeVersion).filter(ResumeVersion.id == version_id_1).first()
     v2 = db.query(ResumeVersion).filter(ResumeVersion.id == version_id_2).first()
     
@@ -510,8 +692,8 @@ async def compare_versions(version_id_1: str, version_id_2: str, db: Session = D
     score_diff = v2.score - v1.score
     
     # Compare sections
-    sections_1 = detect_sections(v1.content)
-    sections_2 = detect_sections(v2.content)
+    sections_1 = detect_sections(v1.content, detect_language(v1.content))
+    sections_2 = detect_sections(v2.content, detect_language(v2.content))
     
     changes = {
         "score_difference": score_diff,
@@ -531,22 +713,72 @@ async def compare_versions(version_id_1: str, version_id_2: str, db: Session = D
     return changes
 
 @app.delete("/versions/{version_id}")
-async def delete_version(version_id: str, db: Session = Depends(get_db)):
+async def delete_version(version_id: str, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
     version = db.query(ResumeVersion).filter(ResumeVersion.id == version_id).first()
     if not version:
         raise HTTPException(status_code=404, detail="Version not found")
     
-    # Delete file if it exists
-    if version.file_path:
-        try:
-            Path(version.file_path).unlink(missing_ok=True)
-        except Exception as e:
-            print(f"Error deleting file: {e}")
+    # Drop the blob reference; unreferenced files are removed by the collector
+    if version.file_hash:
+        release_blob(db, version.file_hash)
+    elif version.file_path:
+        # Uploads from before the blob store are still removed off the request path
+        background_tasks.add_task(remove_legacy_file, version.file_path)
     
+    remove_analytics(db, version)
+    remove_from_index(db, version)
     db.delete(version)
     db.commit()
     return {"message": "Version deleted successfully"}
 
+@app.get("/versions/{version_id}/duplicates")
+async def get_duplicates(version_id: str, threshold: float = DUPLICATE_THRESHOLD, limit: int = 10, db: Session = Depends(get_db)):
+    if not 0 < threshold <= 1:
+        raise HTTPException(status_code=400, detail="threshold must be in (0, 1]")
+    version = db.query(ResumeVersion).filter(ResumeVersion.id == version_id).first()
+    if not version:
+        raise HTTPException(status_code=404, detail="Version not found")
+    
+    # Versions saved before the index existed are hashed on the fly until backfilled
+    signature = unpack_signature(version.minhash) if version.minhash else minhash(version.content)
+    if signature is None:
+        return []
+    matches = dict(find_similar(db, signature, threshold, exclude_id=version_id, limit=min(limit, 100)))
+    duplicates = db.query(ResumeVersion).filter(ResumeVersion.id.in_(matches)).all()
+    return sorted(
+        [
+            {
+                "version_id": duplicate.id,
+                "user_id": duplicate.user_id,
+                "version_name": duplicate.version_name,
+                "score": duplicate.score,
+                "created_at": duplicate.created_at,
+                "similarity": matches[duplicate.id]
+            }
+            for duplicate in duplicates
+        ],
+        key=lambda item: item["similarity"],
+        reverse=True
+    )
+
+@app.get("/users/{user_id}/analytics")
+async def get_user_analytics(user_id: str, db: Session = Depends(get_db)):
+    # Served from the per-user summary row instead of every stored version
+    summary = get_score_summary(db, user_id)
+    if summary is None:
+        raise HTTPException(status_code=404, detail="No versions found for user")
+    return summary
+
+@app.get("/export/{user_id}")
+async def export_versions(user_id: str, format: Literal['zip', 'ndjson'] = 'zip'):
+    if format == 'ndjson':
+        return StreamingResponse(stream_export(user_id, 'ndjson'), media_type="application/x-ndjson")
+    return StreamingResponse(
+        stream_export(user_id, 'zip'),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="resume-export-{user_id}.zip"'}
+    )
+
 # Test data generation
 def generate_test_resume() -> str:
     sections = {
@@ -580,64 +812,60 @@ AI Chatbot
     
     return "\n\n".join(f"{section.upper()}\n{content}" for section, content in sections.items())
 
-def generate_test_versions(user_id: str, count: int = 5, db: Session = None) -> List[ResumeVersion]:
-    versions = []
-    base_score = 75
-    base_date = datetime.utcnow() - timedelta(days=30)
-    
-    for i in range(count):
-        # Generate slightly different content for each version
-        content = generate_test_resume()
-        if i > 0:
-            # Add some random improvements
-            improvements = [
-                "Improved system performance by 50%",
-                "Reduced API response time by 40%",
-                "Implemented automated testing with 95% coverage",
-                "Led a team of 8 developers",
-                "Achieved 99.99% uptime"
-            ]
-            content += f"\n\nAdditional Achievement:\n{random.choice(improvements)}"
-        
-        # Calculate score with some randomness
-        score = min(100, base_score + (i * 5) + random.randint(-2, 2))
-        
-        version = ResumeVersion(
-            user_id=user_id,
-            content=content,
-            score=score,
-            created_at=base_date + timedelta(days=i * 7),
-            version_name=f"Test Version {i + 1}",
-            file_path=None  # No file for test versions
-        )
-        
-        if db:
-            db.add(version)
-            db.commit()
-            db.refresh(version)
-        
-        versions.append(version)
-    
-    return versions
-
 # Developer mode endpoints
 if DEV_MODE:
     @app.post("/dev/generate-test-data")
     async def generate_test_data(user_id: str = None, count: int = 5, db: Session = Depends(get_db)):
         if not user_id:
-            user_id = f"test_user_{uuid.uuid4()}"
+            user_id = f"{TEST_USER_PREFIX}{uuid.uuid4()}"
         
-        # Create test user
-        user = User(id=user_id, email=f"{user_id}@example.com")
-        db.add(user)
+        # Bulk-insert the test user and its versions in a single transaction
+        created = await asyncio.to_thread(seed_user, db.connection(), user_id, count)
         db.commit()
         
-        # Generate test versions
-        versions = generate_test_versions(user_id, count, db)
-        
         return {
             "user_id": user_id,
-            "versions": versions
+            "versions_created": created
+        }
+    
+    def default_executor_stats() -> Dict:
+        # Analyses run through asyncio.to_thread on the loop's default executor,
+        # which is created on first use; its counters are only kept privately
+        executor = asyncio.get_running_loop()._default_executor
+        if executor is None:
+            return {"total": min(32, (os.cpu_count() or 1) + 4), "threads": 0, "busy": 0, "queued": 0}
+        threads = len(executor._threads)
+        return {
+            "total": executor._max_workers,
+            "threads": threads,
+            "busy": threads - executor._idle_semaphore._value,
+            "queued": executor._work_queue.qsize()
+        }
+
+    @app.get("/dev/pool-stats")
+    async def get_pool_stats():
+        # Polled by loadtest.py to see where the connection and thread pools saturate
+        limiter = anyio.to_thread.current_default_thread_limiter()
+        return {
+            "db_pool": {
+                "size": DB_POOL_SIZE,
+                "max_overflow": DB_MAX_OVERFLOW,
+                "checked_out": engine.pool.checkedout(),
+                "overflow": max(0, engine.pool.overflow())
+            },
+            # Sync dependencies (get_db) and endpoints
+            "threadpool": {
+                "total": limiter.total_tokens,
+                "in_use": limiter.borrowed_tokens
+            },
+            "executor": default_executor_stats(),
+            "analysis_admission": {
+                "limit": analysis_admission.limit,
+                "in_flight": analysis_admission.in_flight
+            },
+            "threads": threading.active_count(),
+            "section_cache": section_cache.stats(),
+            "spacy_models": model_pool.stats()
         }
     
     @app.get("/dev/test-resume")
@@ -649,12 +877,10 @@ if DEV_MODE:
     
     @app.delete("/dev/clear-test-data")
     async def clear_test_data(db: Session = Depends(get_db)):
-        # Delete all test users and their versions
-        test_users = db.query(User).filter(User.email.like("test_user_%")).all()
-        for user in test_users:
-            db.delete(user)
+        # Set-based delete of all test users and their versions
+        deleted = clear_seeded_users(db.connection())
         db.commit()
-        return {"message": "Test data cleared successfully"}
+        return {"message": "Test data cleared successfully", "users_deleted": deleted}
 
 if __name__ == "__main__":
     import uvicorn
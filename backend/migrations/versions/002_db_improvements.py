@@ -8,6 +8,12 @@ Create Date: 2024-01-01 01:00:00.000000
 from alembic import op
 import sqlalchemy as sa
 
+# revision identifiers, used by Alembic.
+revision = '002'
+down_revision = '001'
+branch_labels = None
+depends_on = None
+
 def upgrade() -> None:
     # Add new columns
     op.add_column('resume_versions', sa.Column('updated_at', sa.DateTime(), nullable=True))
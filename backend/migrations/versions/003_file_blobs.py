@@ -0,0 +1,39 @@
+"""content-addressed file blobs
+
+Revision ID: 003
+Revises: 002
+Create Date: 2024-01-01 02:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_table(
+        'file_blobs',
+        sa.Column('sha256', sa.String(64), nullable=False),
+        sa.Column('path', sa.String(), nullable=False),
+        sa.Column('size', sa.Integer(), nullable=False),
+        sa.Column('ref_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('sha256')
+    )
+    op.create_index('ix_file_blobs_ref_count', 'file_blobs', ['ref_count'])
+
+    op.add_column('resume_versions', sa.Column('file_hash', sa.String(64), nullable=True))
+    op.create_index('ix_resume_versions_file_hash', 'resume_versions', ['file_hash'])
+    op.create_foreign_key('fk_resume_versions_file_hash', 'resume_versions', 'file_blobs', ['file_hash'], ['sha256'])
+
+def downgrade() -> None:
+    op.drop_constraint('fk_resume_versions_file_hash', 'resume_versions', type_='foreignkey')
+    op.drop_index('ix_resume_versions_file_hash', table_name='resume_versions')
+    op.drop_column('resume_versions', 'file_hash')
+    op.drop_index('ix_file_blobs_ref_count', table_name='file_blobs')
+    op.drop_table('file_blobs')
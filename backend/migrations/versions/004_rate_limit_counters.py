@@ -0,0 +1,27 @@
+"""rate limit counters
+
+Revision ID: 004
+Revises: 003
+Create Date: 2024-01-01 03:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_table(
+        'rate_limit_counters',
+        sa.Column('key', sa.String(), nullable=False),
+        sa.Column('window_start', sa.BigInteger(), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('key', 'window_start')
+    )
+
+def downgrade() -> None:
+    op.drop_table('rate_limit_counters')
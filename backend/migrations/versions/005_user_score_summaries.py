@@ -0,0 +1,38 @@
+"""user score summaries
+
+Revision ID: 005
+Revises: 004
+Create Date: 2024-01-01 04:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.add_column('resume_versions', sa.Column('section_scores', sa.JSON(), nullable=True))
+
+    op.create_table(
+        'user_score_summaries',
+        sa.Column('user_id', sa.String(), nullable=False),
+        sa.Column('version_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('first_score', sa.Float(), nullable=True),
+        sa.Column('latest_score', sa.Float(), nullable=True),
+        sa.Column('best_score', sa.Float(), nullable=True),
+        sa.Column('average_score', sa.Float(), nullable=True),
+        sa.Column('score_history', sa.JSON(), nullable=False),
+        sa.Column('section_history', sa.JSON(), nullable=False),
+        sa.Column('most_improved', sa.JSON(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id')
+    )
+
+def downgrade() -> None:
+    op.drop_table('user_score_summaries')
+    op.drop_column('resume_versions', 'section_scores')
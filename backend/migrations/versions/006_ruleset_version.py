@@ -0,0 +1,24 @@
+"""ruleset version on resume versions
+
+Revision ID: 006
+Revises: 005
+Create Date: 2024-01-01 05:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    # NULL marks versions scored before rulesets were tracked; rescore.py picks them up
+    op.add_column('resume_versions', sa.Column('ruleset_version', sa.Integer(), nullable=True))
+    op.create_index('ix_resume_versions_ruleset_version', 'resume_versions', ['ruleset_version'])
+
+def downgrade() -> None:
+    op.drop_index('ix_resume_versions_ruleset_version', table_name='resume_versions')
+    op.drop_column('resume_versions', 'ruleset_version')
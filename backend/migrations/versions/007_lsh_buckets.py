@@ -0,0 +1,41 @@
+"""minhash signatures and lsh buckets
+
+Revision ID: 007
+Revises: 006
+Create Date: 2024-01-01 06:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.add_column('resume_versions', sa.Column('minhash', sa.LargeBinary(), nullable=True))
+    op.add_column('resume_versions', sa.Column('duplicate_of', sa.String(), nullable=True))
+    op.create_foreign_key(
+        'fk_resume_versions_duplicate_of', 'resume_versions', 'resume_versions',
+        ['duplicate_of'], ['id'], ondelete='SET NULL'
+    )
+    op.create_index('ix_resume_versions_duplicate_of', 'resume_versions', ['duplicate_of'])
+
+    op.create_table(
+        'lsh_buckets',
+        sa.Column('bucket', sa.String(length=24), nullable=False),
+        sa.Column('version_id', sa.String(), nullable=False),
+        sa.ForeignKeyConstraint(['version_id'], ['resume_versions.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('bucket', 'version_id')
+    )
+    op.create_index('ix_lsh_buckets_version_id', 'lsh_buckets', ['version_id'])
+
+def downgrade() -> None:
+    op.drop_index('ix_lsh_buckets_version_id', table_name='lsh_buckets')
+    op.drop_table('lsh_buckets')
+    op.drop_index('ix_resume_versions_duplicate_of', table_name='resume_versions')
+    op.drop_constraint('fk_resume_versions_duplicate_of', 'resume_versions', type_='foreignkey')
+    op.drop_column('resume_versions', 'duplicate_of')
+    op.drop_column('resume_versions', 'minhash')
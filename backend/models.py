@@ -1,11 +1,15 @@
-from sqlalchemy import Column, String, Float, DateTime, ForeignKey, Text, Boolean, Index, UniqueConstraint, Integer, Table, ARRAY
+from sqlalchemy import Column, String, Float, DateTime, ForeignKey, Text, Boolean, Index, UniqueConstraint, Integer, BigInteger, Table, ARRAY, JSON, LargeBinary
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import deferred, relationship
 from datetime import datetime
 import uuid
 
 Base = declarative_base()
 
+def array_of(item_type):
+    # Native arrays on PostgreSQL, JSON lists on the SQLite stand-in
+    return ARRAY(item_type).with_variant(JSON(), "sqlite")
+
 class User(Base):
     __tablename__ = "users"
     
@@ -39,6 +43,19 @@ user_skills = Table(
     Index("ix_user_skills_skill_id", "skill_id")
 )
 
+class FileBlob(Base):
+    __tablename__ = "file_blobs"
+    __table_args__ = (
+        Index('ix_file_blobs_ref_count', 'ref_count'),
+    )
+    
+    sha256 = Column(String(64), primary_key=True)
+    path = Column(String, nullable=False)
+    size = Column(Integer, nullable=False)
+    ref_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
 class ResumeVersion(Base):
     __tablename__ = "resume_versions"
     __table_args__ = (
@@ -58,15 +75,49 @@ class ResumeVersion(Base):
     file_original_name = Column(String, nullable=True)
     file_size = Column(Integer, nullable=True)
     file_mime_type = Column(String, nullable=True)
+    file_hash = Column(String(64), ForeignKey("file_blobs.sha256"), nullable=True, index=True)
     is_deleted = Column(Boolean, default=False, nullable=False)
+    section_scores = Column(JSON, nullable=True)  # {section name: score} at save time
+    ruleset_version = Column(Integer, nullable=True, index=True)  # analysis ruleset that produced the scores
+    # Packed MinHash signature of content (see dedup.py); deferred so listings don't load or serialize it
+    minhash = deferred(Column(LargeBinary, nullable=True))
+    duplicate_of = Column(String, ForeignKey("resume_versions.id", ondelete="SET NULL"), nullable=True, index=True)
     
     # New fields
     summary = Column(Text)
-    skills = Column(ARRAY(String))
-    experience = Column(ARRAY(Text))  # Store as JSON array of experience entries
-    education = Column(ARRAY(Text))   # Store as JSON array of education entries
-    certifications = Column(ARRAY(Text))
-    languages = Column(ARRAY(String))
-    projects = Column(ARRAY(Text))
+    skills = Column(array_of(String))
+    experience = Column(array_of(Text))  # Store as JSON array of experience entries
+    education = Column(array_of(Text))   # Store as JSON array of education entries
+    certifications = Column(array_of(Text))
+    languages = Column(array_of(String))
+    projects = Column(array_of(Text))
+    
+    user = relationship("User", back_populates="versions") 
+
+class UserScoreSummary(Base):
+    __tablename__ = "user_score_summaries"
+    
+    user_id = Column(String, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    version_count = Column(Integer, nullable=False, default=0)
+    first_score = Column(Float)
+    latest_score = Column(Float)
+    best_score = Column(Float)
+    average_score = Column(Float)
+    score_history = Column(JSON, nullable=False, default=list)    # [{version_id, created_at, score}]
+    section_history = Column(JSON, nullable=False, default=dict)  # {section: [{version_id, created_at, score}]}
+    most_improved = Column(JSON, nullable=False, default=list)    # [{section, change}]
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class RateLimitCounter(Base):
+    __tablename__ = "rate_limit_counters"
+    
+    key = Column(String, primary_key=True)
+    window_start = Column(BigInteger, primary_key=True)  # Unix timestamp of the window start
+    count = Column(Integer, nullable=False, default=0)
+
+class LshBucket(Base):
+    """Locality-sensitive hashing index: one row per (band bucket, version)."""
+    __tablename__ = "lsh_buckets"
     
-    user = relationship("User", back_populates="versions") 
\ No newline at end of file
+    bucket = Column(String(24), primary_key=True)  # "<band>:<hash of the band's rows>"
+    version_id = Column(String, ForeignKey("resume_versions.id", ondelete="CASCADE"), primary_key=True, index=True)
@@ -0,0 +1,179 @@
+import asyncio
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Iterable, List, Optional
+
+from sqlalchemy import delete
+from sqlalchemy.dialects import postgresql, sqlite
+from fastapi import HTTPException
+from sqlalchemy.engine import Engine
+from starlette.responses import JSONResponse
+
+from models import RateLimitCounter
+
+# CONTEXT.md: "Rate limiting: 100 requests/hour per IP"; 0 disables the limiter
+RATE_LIMIT_PER_HOUR = int(os.getenv('RATE_LIMIT_PER_HOUR', 100))
+RATE_LIMIT_BACKEND = os.getenv('RATE_LIMIT_BACKEND', 'memory')  # memory | database
+# Default matches asyncio.to_thread's executor so admitted work never queues behind it
+MAX_CONCURRENT_ANALYSES = int(os.getenv('MAX_CONCURRENT_ANALYSES', min(32, (os.cpu_count() or 1) + 4)))
+TRUST_FORWARDED_FOR = os.getenv('TRUST_FORWARDED_FOR', 'false').lower() == 'true'
+
+
+class TokenBucketLimiter:
+    """Per-key token buckets kept in process memory.
+
+    Buckets refill continuously at ``rate`` tokens per second up to
+    ``capacity``. The least recently seen keys are dropped beyond ``max_keys``.
+    """
+
+    def __init__(self, rate: float, capacity: float, max_keys: int = 100_000,
+                 clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self.max_keys = max_keys
+        self.clock = clock
+        self._buckets: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def acquire(self, key: str, tokens: float = 1) -> float:
+        """Take ``tokens`` from ``key``'s bucket; returns 0 or the seconds to wait."""
+        now = self.clock()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [self.capacity, now]
+                if len(self._buckets) > self.max_keys:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+                bucket[0] = min(self.capacity, bucket[0] + (now - bucket[1]) * self.rate)
+                bucket[1] = now
+            if bucket[0] >= tokens:
+                bucket[0] -= tokens
+                return 0.0
+            return (tokens - bucket[0]) / self.rate
+
+    async def check(self, key: str) -> float:
+        return self.acquire(key)
+
+
+class DatabaseRateLimiter:
+    """Fixed-window counters in the shared database, for multi-worker setups."""
+
+    def __init__(self, engine: Engine, limit: int, window: int = 3600, clock: Callable[[], float] = time.time):
+        self.engine = engine
+        self.limit = limit
+        self.window = window
+        self.clock = clock
+        self._insert = postgresql.insert if engine.dialect.name == 'postgresql' else sqlite.insert
+        self._last_cleanup = 0
+
+    def acquire(self, key: str) -> float:
+        now = self.clock()
+        window_start = int(now // self.window * self.window)
+        statement = self._insert(RateLimitCounter).values(key=key, window_start=window_start, count=1)
+        statement = statement.on_conflict_do_update(
+            index_elements=['key', 'window_start'],
+            set_={'count': RateLimitCounter.count + 1}
+        ).returning(RateLimitCounter.count)
+        with self.engine.begin() as connection:
+            count = connection.execute(statement).scalar_one()
+            if window_start != self._last_cleanup:
+                # Once per window, drop counters from earlier windows
+                self._last_cleanup = window_start
+                connection.execute(delete(RateLimitCounter).where(RateLimitCounter.window_start < window_start))
+        if count > self.limit:
+            return window_start + self.window - now
+        return 0.0
+
+    async def check(self, key: str) -> float:
+        return await asyncio.to_thread(self.acquire, key)
+
+
+class AdmissionController:
+    """Caps in-flight requests; excess requests are rejected instead of queued."""
+
+    def __init__(self, limit: int, retry_after: int = 1):
+        self.limit = limit
+        self.retry_after = retry_after
+        self.in_flight = 0
+
+    def try_acquire(self) -> bool:
+        # Only touched from the event loop thread, so no lock is needed
+        if self.in_flight >= self.limit:
+            return False
+        self.in_flight += 1
+        return True
+
+    def release(self) -> None:
+        self.in_flight -= 1
+
+    async def slot(self):
+        """FastAPI dependency that holds a slot for the rest of the request.
+
+        FastAPI reads the request body before resolving dependencies, so
+        clients trickling in slow uploads don't tie up slots.
+        """
+        if not self.try_acquire():
+            raise HTTPException(
+                status_code=503,
+                detail="Server is busy, please retry shortly",
+                headers={"Retry-After": str(self.retry_after)}
+            )
+        try:
+            yield
+        finally:
+            self.release()
+
+
+def build_rate_limiter(engine: Optional[Engine] = None):
+    if RATE_LIMIT_PER_HOUR <= 0:
+        return None
+    if RATE_LIMIT_BACKEND == 'database':
+        if engine is None:
+            from database import engine
+        return DatabaseRateLimiter(engine, RATE_LIMIT_PER_HOUR)
+    return TokenBucketLimiter(rate=RATE_LIMIT_PER_HOUR / 3600, capacity=RATE_LIMIT_PER_HOUR)
+
+
+def client_ip(scope) -> str:
+    if TRUST_FORWARDED_FOR:
+        for name, value in scope.get('headers', []):
+            if name == b'x-forwarded-for':
+                return value.decode('latin-1').split(',')[0].strip()
+    client = scope.get('client')
+    return client[0] if client else 'unknown'
+
+
+class RateLimitMiddleware:
+    """Per-IP rate limits for expensive endpoints.
+
+    Runs before the request body is read, so rejected uploads cost almost
+    nothing. Clients are keyed by IP only: ``user_id`` is an unauthenticated
+    query parameter, and keying on it would let anyone spend another user's
+    budget.
+    """
+
+    def __init__(self, app, paths: Iterable[str], limiter=None):
+        self.app = app
+        self.paths = set(paths)
+        self.limiter = limiter
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or scope['path'] not in self.paths or self.limiter is None:
+            await self.app(scope, receive, send)
+            return
+
+        retry_after = await self.limiter.check(f"ip:{client_ip(scope)}")
+        if retry_after > 0:
+            response = JSONResponse(
+                {"detail": "Rate limit exceeded"},
+                status_code=429,
+                headers={"Retry-After": str(math.ceil(retry_after))}
+            )
+            await response(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
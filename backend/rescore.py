@@ -0,0 +1,206 @@
+import argparse
+import json
+import logging
+import os
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import bindparam, or_, select, tuple_, update
+from sqlalchemy.orm import Session
+
+from analytics import rebuild_summary
+from models import ResumeVersion
+from ratelimit import TokenBucketLimiter
+
+logger = logging.getLogger(__name__)
+
+RESCORE_BATCH_SIZE = int(os.getenv('RESCORE_BATCH_SIZE', 500))
+
+_analyze_resume = None
+_ruleset_version = None
+
+
+def _init_worker(niceness: int = 0) -> None:
+    # Each worker process loads the analyzers (and spaCy) once
+    global _analyze_resume, _ruleset_version
+    if niceness:
+        os.nice(niceness)
+    from main import RULESET_VERSION, analyze_resume
+    _analyze_resume = analyze_resume
+    _ruleset_version = RULESET_VERSION
+
+
+def rescore_batch(rows: List[Tuple[str, str]]) -> List[Dict]:
+    results = []
+    for version_id, content in rows:
+        analysis = _analyze_resume(content)
+        results.append({
+            'id': version_id,
+            'score': analysis['score'],
+            'section_scores': {name: section['score'] for name, section in analysis['sections'].items()},
+            'ruleset_version': _ruleset_version,
+        })
+    return results
+
+
+def load_checkpoint(path: Optional[Path], ruleset_version: int) -> Dict:
+    if path and path.exists():
+        checkpoint = json.loads(path.read_text())
+        if checkpoint.get('ruleset_version') == ruleset_version:
+            return checkpoint
+    # last_key: (user_id, id) of the last committed row; pending_user: its user,
+    # whose summary is rebuilt once the rest of their versions are written
+    return {'ruleset_version': ruleset_version, 'last_key': None, 'pending_user': None, 'processed': 0}
+
+
+def save_checkpoint(path: Optional[Path], checkpoint: Dict) -> None:
+    if not path:
+        return
+    temp_path = path.with_name(path.name + '.tmp')
+    temp_path.write_text(json.dumps(checkpoint))
+    os.replace(temp_path, path)
+
+
+_versions = ResumeVersion.__table__
+# Core executemany: unlike the ORM bulk UPDATE it doesn't check row counts,
+# so versions deleted by users while their batch was analyzed are skipped
+_update_scores = update(_versions).where(_versions.c.id == bindparam('version_id'))
+
+
+def _write_batch(db: Session, checkpoint: Dict, batch: List[Tuple[str, str, str]],
+                 results: List[Dict], final: bool) -> None:
+    now = datetime.utcnow()
+    db.execute(_update_scores, [
+        {
+            'version_id': result['id'],
+            'score': result['score'],
+            'section_scores': result['section_scores'],
+            'ruleset_version': result['ruleset_version'],
+            'updated_at': now,
+        }
+        for result in results
+    ])
+    # Rows arrive grouped by user, so each summary is rebuilt once, in the same
+    # transaction as the last of its user's scores. The batch's last user may
+    # continue into the next batch and is carried over.
+    users = [checkpoint['pending_user']] if checkpoint['pending_user'] else []
+    users += [user_id for _, user_id, _ in batch]
+    pending_user = None if final else users[-1]
+    for user_id in dict.fromkeys(users):
+        if user_id != pending_user:
+            rebuild_summary(db, user_id)
+    db.commit()
+    checkpoint['pending_user'] = pending_user
+
+
+def rescore(
+    session_factory: Callable[[], Session],
+    executor: Executor,
+    ruleset_version: int,
+    batch_size: int = RESCORE_BATCH_SIZE,
+    checkpoint_path: Optional[Path] = None,
+    max_rows_per_second: float = 0,
+    limit: Optional[int] = None,
+    analyze_batch: Callable[[List[Tuple[str, str]]], List[Dict]] = rescore_batch,
+    max_pending: int = 4,
+) -> Dict:
+    """Rescore versions analyzed under an older ruleset.
+
+    Versions are streamed in (user_id, id) order through a server-side
+    cursor and analyzed in batches on ``executor``. Results are written back
+    in submission order, so the checkpoint's ``last_key`` only ever covers
+    committed batches and an interrupted run resumes right after it.
+    """
+    checkpoint = load_checkpoint(checkpoint_path, ruleset_version)
+    throttle = None
+    if max_rows_per_second > 0:
+        throttle = TokenBucketLimiter(rate=max_rows_per_second, capacity=max(batch_size, max_rows_per_second))
+
+    query = (
+        select(ResumeVersion.id, ResumeVersion.user_id, ResumeVersion.content)
+        .where(or_(ResumeVersion.ruleset_version.is_(None), ResumeVersion.ruleset_version < ruleset_version))
+        .order_by(ResumeVersion.user_id, ResumeVersion.id)
+        .execution_options(yield_per=batch_size)
+    )
+    if checkpoint['last_key'] is not None:
+        query = query.where(tuple_(ResumeVersion.user_id, ResumeVersion.id) > tuple(checkpoint['last_key']))
+    if limit:
+        query = query.limit(limit)
+
+    reader = session_factory()
+    writer = session_factory()
+    pending = deque()
+    started = time.perf_counter()
+
+    def drain(keep: int, final: bool = False) -> None:
+        while len(pending) > keep:
+            batch, future = pending.popleft()
+            _write_batch(writer, checkpoint, batch, future.result(), final=final and not pending)
+            checkpoint['last_key'] = [batch[-1][1], batch[-1][0]]
+            checkpoint['processed'] += len(batch)
+            save_checkpoint(checkpoint_path, checkpoint)
+            elapsed = time.perf_counter() - started
+            logger.info("Rescored %d versions (%.0f/s)", checkpoint['processed'], checkpoint['processed'] / max(elapsed, 1e-9))
+
+    try:
+        for partition in reader.execute(query).partitions():
+            batch = [tuple(row) for row in partition]
+            if throttle:
+                while (wait := throttle.acquire('rescore', len(batch))) > 0:
+                    time.sleep(wait)
+            future = executor.submit(analyze_batch, [(version_id, content) for version_id, _, content in batch])
+            pending.append((batch, future))
+            drain(keep=max_pending)
+        drain(keep=0, final=True)
+        if checkpoint['pending_user']:
+            # Resumed after the last batch was written but before its user was summarized
+            rebuild_summary(writer, checkpoint['pending_user'])
+            writer.commit()
+            checkpoint['pending_user'] = None
+            save_checkpoint(checkpoint_path, checkpoint)
+    finally:
+        reader.close()
+        writer.close()
+    return checkpoint
+
+
+def main(argv=None) -> None:
+    from database import SessionLocal
+    from main import RULESET_VERSION
+
+    parser = argparse.ArgumentParser(description="Rescore stored resume versions after a ruleset change")
+    parser.add_argument('--batch-size', type=int, default=RESCORE_BATCH_SIZE)
+    parser.add_argument('--workers', type=int, default=max(1, (os.cpu_count() or 2) // 2),
+                        help="Analysis processes (default: half the CPUs, leaving room for live traffic)")
+    parser.add_argument('--max-rows-per-second', type=float, default=0, help="Throttle; 0 means unlimited")
+    parser.add_argument('--nice', type=int, default=10, help="Niceness increment for worker processes")
+    parser.add_argument('--checkpoint', default='rescore.checkpoint.json', help="Progress file used to resume")
+    parser.add_argument('--reset', action='store_true', help="Ignore an existing checkpoint")
+    parser.add_argument('--limit', type=int, help="Stop after this many versions")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    checkpoint_path = Path(args.checkpoint)
+    if args.reset:
+        checkpoint_path.unlink(missing_ok=True)
+
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker, initargs=(args.nice,)) as executor:
+        checkpoint = rescore(
+            SessionLocal,
+            executor,
+            RULESET_VERSION,
+            batch_size=args.batch_size,
+            checkpoint_path=checkpoint_path,
+            max_rows_per_second=args.max_rows_per_second,
+            limit=args.limit,
+            max_pending=args.workers * 2,
+        )
+    print(f"Rescored {checkpoint['processed']} versions to ruleset {RULESET_VERSION}")
+
+
+if __name__ == "__main__":
+    main()
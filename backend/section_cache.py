@@ -0,0 +1,50 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+
+def section_key(name: str, industry: str, language: str, content: str,
+                ruleset_version: int) -> Tuple[str, str, str, str, int]:
+    return (name, industry, language, hashlib.sha256(content.encode('utf-8')).hexdigest(), ruleset_version)
+
+
+class SectionCache:
+    """Thread-safe LRU of per-section analysis results.
+
+    Keys come from ``section_key`` so an unchanged section in a new resume
+    version reuses its previous result instead of being re-analyzed.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        # Computed outside the lock; two threads may occasionally both miss on
+        # the same section, which only costs a duplicate analysis
+        value = compute()
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'size': len(self._entries), 'hits': self.hits, 'misses': self.misses}
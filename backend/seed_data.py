@@ -0,0 +1,241 @@
+import argparse
+import csv
+import io
+import os
+import random
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.engine import Connection
+
+from models import User, ResumeVersion, UserScoreSummary
+
+SEED_BATCH_SIZE = int(os.getenv('SEED_BATCH_SIZE', 10000))
+TEST_USER_PREFIX = "test_user_"
+
+# Building blocks for synthetic resumes; combined at random so that section
+# text, lengths and keyword coverage vary from row to row
+ROLES = [
+    "Software Engineer", "Senior Software Engineer", "Staff Engineer", "Backend Developer",
+    "Frontend Developer", "Full Stack Developer", "Data Scientist", "Data Engineer",
+    "Machine Learning Engineer", "DevOps Engineer", "Site Reliability Engineer",
+    "Product Manager", "Senior Product Manager", "Engineering Manager", "QA Engineer",
+]
+COMPANIES = [
+    "Tech Corp", "Startup Inc", "Globex", "Initech", "Umbrella Labs", "Hooli", "Stark Industries",
+    "Wayne Enterprises", "Acme Analytics", "Cyberdyne Systems", "Soylent Data", "Vandelay Cloud",
+]
+ACTION_VERBS = [
+    "Developed", "Created", "Implemented", "Managed", "Led", "Increased", "Improved", "Achieved",
+    "Delivered", "Optimized", "Designed", "Architected", "Launched", "Initiated", "Coordinated",
+    "Established", "Enhanced", "Streamlined", "Spearheaded", "Built", "Maintained", "Worked on",
+]
+OBJECTS = [
+    "microservices using {skill}", "a data pipeline in {skill}", "RESTful APIs with {skill}",
+    "the CI/CD pipeline on {skill}", "an internal dashboard in {skill}", "the billing platform",
+    "a recommendation engine using {skill}", "the mobile onboarding flow", "search infrastructure on {skill}",
+    "the product roadmap for {skill} integrations", "automated testing for the {skill} codebase",
+]
+OUTCOMES = [
+    "improving performance by {pct}%", "reducing costs by ${money}K", "serving {users}K users",
+    "with {pct}% test coverage", "cutting response time by {pct}%", "resulting in {pct}% growth",
+    "achieving {pct}% efficiency improvement", "", "", "",
+]
+SKILLS = {
+    'programming': ['Python', 'JavaScript', 'Java', 'C++', 'Go', 'Rust', 'TypeScript', 'Kotlin', 'Scala', 'R', 'SQL'],
+    'frameworks': ['React', 'Angular', 'Vue', 'Django', 'Flask', 'Spring', 'Express', 'FastAPI', 'Node.js'],
+    'databases': ['PostgreSQL', 'MySQL', 'MongoDB', 'Redis', 'Cassandra', 'Elasticsearch'],
+    'cloud': ['AWS', 'Azure', 'GCP', 'Docker', 'Kubernetes', 'Terraform', 'Ansible'],
+    'data': ['Pandas', 'NumPy', 'scikit-learn', 'TensorFlow', 'PyTorch', 'Spark', 'Tableau'],
+    'product': ['Agile', 'Scrum', 'Kanban', 'Jira', 'Figma', 'Amplitude', 'user stories', 'market research'],
+}
+DEGREES = [
+    "Bachelor of Science in Computer Science", "Bachelor of Arts in Mathematics",
+    "Master of Science in Data Science", "Master of Business Administration",
+    "PhD in Machine Learning", "B.S. in Electrical Engineering", "M.S. in Software Engineering",
+]
+SCHOOLS = ["University of Technology", "State University", "Institute of Science", "City College", "Tech Institute"]
+SUMMARIES = [
+    "Experienced {role} with a passion for building scalable applications.",
+    "{role} with {years} years of experience delivering products used by millions.",
+    "Results-driven {role} focused on {skill} and {skill2}.",
+    "Detail-oriented {role} who enjoys mentoring and shipping reliable software.",
+]
+CERTIFICATIONS = [
+    "AWS Certified Solutions Architect", "Certified Kubernetes Administrator", "Certified Scrum Master",
+    "Google Professional Data Engineer", "Azure Developer Associate", "PMP",
+]
+VERSION_NAMES = ["Draft", "Tailored", "Final", "Updated", "Revised", "Short", "Long"]
+
+
+def _uuid(rng: random.Random) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def _bullet(rng: random.Random, skills: List[str]) -> str:
+    thing = rng.choice(OBJECTS).format(skill=rng.choice(skills))
+    outcome = rng.choice(OUTCOMES).format(pct=rng.randint(5, 90), money=rng.randint(10, 900), users=rng.randint(1, 999))
+    return f"- {rng.choice(ACTION_VERBS)} {thing}" + (f", {outcome}" if outcome else "")
+
+
+def generate_resume(rng: random.Random) -> str:
+    skill_pool = [skill for values in SKILLS.values() for skill in values]
+    skills = rng.sample(skill_pool, rng.randint(4, 16))
+    role = rng.choice(ROLES)
+    sections = {
+        "summary": rng.choice(SUMMARIES).format(role=role, years=rng.randint(2, 15), skill=skills[0], skill2=skills[1]),
+    }
+
+    jobs = []
+    year = 2024
+    for _ in range(rng.randint(1, 4)):
+        start = year - rng.randint(1, 4)
+        bullets = "\n".join(_bullet(rng, skills) for _ in range(rng.randint(2, 6)))
+        jobs.append(f"{rng.choice(ROLES)} at {rng.choice(COMPANIES)} ({start}-{year})\n{bullets}")
+        year = start
+    sections["experience"] = "\n\n".join(jobs)
+
+    graduation = year - rng.randint(0, 2)
+    education = f"{rng.choice(DEGREES)}\n{rng.choice(SCHOOLS)}, {graduation - 4}-{graduation}"
+    if rng.random() < 0.6:
+        education += f"\nGPA: {rng.uniform(2.8, 4.0):.1f}/4.0"
+    sections["education"] = education
+
+    skill_lines = []
+    for category, values in SKILLS.items():
+        listed = [skill for skill in skills if skill in values]
+        if listed:
+            skill_lines.append(f"{category.title()}: {', '.join(listed)}")
+    sections["skills"] = "\n".join(skill_lines)
+    if rng.random() < 0.7:
+        sections["projects"] = "\n".join(_bullet(rng, skills) for _ in range(rng.randint(1, 4)))
+    if rng.random() < 0.3:
+        sections["certifications"] = "\n".join(rng.sample(CERTIFICATIONS, rng.randint(1, 3)))
+
+    return "\n\n".join(f"{section.upper()}\n{content}" for section, content in sections.items())
+
+
+def build_version_rows(user_id: str, count: int, rng: random.Random,
+                       start: Optional[datetime] = None) -> Iterator[Dict]:
+    start = start or datetime.utcnow() - timedelta(days=7 * count)
+    score = rng.uniform(45, 80)
+    for i in range(count):
+        created_at = start + timedelta(days=7 * i, minutes=rng.randint(0, 60 * 24))
+        yield {
+            'id': _uuid(rng),
+            'user_id': user_id,
+            'content': generate_resume(rng),
+            'score': round(score, 1),
+            'created_at': created_at,
+            'updated_at': created_at,
+            'version_name': f"{rng.choice(VERSION_NAMES)} {i + 1}",
+            'is_deleted': False,
+        }
+        # Later versions tend to score higher, as users act on suggestions
+        score = min(100, max(0, score + rng.uniform(-3, 6)))
+
+
+def build_user_row(user_id: str) -> Dict:
+    now = datetime.utcnow()
+    return {
+        'id': user_id,
+        'email': f"{user_id}@example.com",
+        'password_hash': "",
+        'created_at': now,
+        'updated_at': now,
+        'is_active': True,
+    }
+
+
+def _batched(rows: Iterable[Dict], batch_size: int) -> Iterator[List[Dict]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _copy_batch(connection: Connection, table, batch: List[Dict]) -> None:
+    columns = list(batch[0].keys())
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in batch:
+        writer.writerow([
+            value.isoformat() if isinstance(value, datetime) else value
+            for value in (row[column] for column in columns)
+        ])
+    buffer.seek(0)
+    cursor = connection.connection.dbapi_connection.cursor()
+    try:
+        cursor.copy_expert(f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+    finally:
+        cursor.close()
+
+
+def bulk_insert(connection: Connection, table, rows: Iterable[Dict], batch_size: int = SEED_BATCH_SIZE) -> int:
+    """Insert ``rows`` in batches: COPY on PostgreSQL, executemany elsewhere."""
+    inserted = 0
+    use_copy = connection.dialect.name == 'postgresql'
+    for batch in _batched(rows, batch_size):
+        if use_copy:
+            _copy_batch(connection, table, batch)
+        else:
+            connection.execute(insert(table), batch)
+        inserted += len(batch)
+    return inserted
+
+
+def seed_user(connection: Connection, user_id: str, count: int, rng: Optional[random.Random] = None) -> int:
+    rng = rng or random.Random()
+    bulk_insert(connection, User.__table__, [build_user_row(user_id)])
+    return bulk_insert(connection, ResumeVersion.__table__, build_version_rows(user_id, count, rng))
+
+
+def seed(connection: Connection, users: int, versions_per_user: int, rng: random.Random,
+         batch_size: int = SEED_BATCH_SIZE) -> int:
+    user_ids = [f"{TEST_USER_PREFIX}{_uuid(rng)}" for _ in range(users)]
+    bulk_insert(connection, User.__table__, (build_user_row(user_id) for user_id in user_ids), batch_size)
+    rows = (
+        row
+        for user_id in user_ids
+        for row in build_version_rows(user_id, rng.randint(1, 2 * versions_per_user - 1) if versions_per_user > 1 else 1, rng)
+    )
+    return bulk_insert(connection, ResumeVersion.__table__, rows, batch_size)
+
+
+def clear_test_data(connection: Connection) -> int:
+    test_users = select(User.id).where(User.email.like(f"{TEST_USER_PREFIX}%"))
+    connection.execute(delete(ResumeVersion).where(ResumeVersion.user_id.in_(test_users)))
+    connection.execute(delete(UserScoreSummary).where(UserScoreSummary.user_id.in_(test_users)))
+    return connection.execute(delete(User).where(User.id.in_(test_users))).rowcount
+
+
+def main(argv=None) -> None:
+    from database import engine
+
+    parser = argparse.ArgumentParser(description="Seed the database with synthetic users and resume versions")
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--versions-per-user', type=int, default=10, help="Average number of versions per user")
+    parser.add_argument('--batch-size', type=int, default=SEED_BATCH_SIZE)
+    parser.add_argument('--seed', type=int, default=None, help="Random seed for reproducible data")
+    parser.add_argument('--clear', action='store_true', help="Delete existing test data instead of seeding")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    with engine.begin() as connection:
+        if args.clear:
+            print(f"Deleted {clear_test_data(connection)} test users")
+        else:
+            inserted = seed(connection, args.users, args.versions_per_user, random.Random(args.seed), args.batch_size)
+            print(f"Inserted {args.users} users and {inserted} versions")
+    print(f"Done in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+import argparse
+import asyncio
+import hashlib
+import logging
+import os
+import tempfile
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, Optional
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from models import FileBlob, ResumeVersion
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_DIR = Path(os.getenv('UPLOAD_DIR', 'uploads'))
+CHUNK_SIZE = 64 * 1024
+# Blobs and temp files younger than this are never collected, which covers
+# uploads whose database transaction has not committed yet
+BLOB_GC_GRACE = int(os.getenv('BLOB_GC_GRACE', 3600))
+
+
+@dataclass
+class StagedBlob:
+    sha256: str
+    size: int
+    temp_path: Path
+
+
+class BlobStore:
+    """Content-addressed file store: ``<root>/blobs/ab/cd/<sha256>``.
+
+    Files are streamed to ``<root>/tmp`` while being hashed and then moved into
+    place with an atomic rename, so readers never observe partial blobs.
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.blob_dir = self.root / 'blobs'
+        self.tmp_dir = self.root / 'tmp'
+        self.blob_dir.mkdir(parents=True, exist_ok=True)
+        self.tmp_dir.mkdir(parents=True, exist_ok=True)
+
+    def path_for(self, sha256: str) -> Path:
+        return self.blob_dir / sha256[:2] / sha256[2:4] / sha256
+
+    def stage(self, source: BinaryIO) -> StagedBlob:
+        digest = hashlib.sha256()
+        size = 0
+        fd, temp_name = tempfile.mkstemp(dir=self.tmp_dir)
+        try:
+            with os.fdopen(fd, 'wb') as buffer:
+                while True:
+                    chunk = source.read(CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    digest.update(chunk)
+                    buffer.write(chunk)
+                    size += len(chunk)
+                buffer.flush()
+                os.fsync(buffer.fileno())
+        except BaseException:
+            Path(temp_name).unlink(missing_ok=True)
+            raise
+        return StagedBlob(sha256=digest.hexdigest(), size=size, temp_path=Path(temp_name))
+
+    def commit(self, staged: StagedBlob) -> Path:
+        path = self.path_for(staged.sha256)
+        if path.exists():
+            # Same content is already stored; refresh its mtime so the orphan
+            # sweep treats it as recently referenced
+            staged.temp_path.unlink(missing_ok=True)
+            os.utime(path)
+            return path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(staged.temp_path, path)
+        return path
+
+    def discard(self, staged: StagedBlob) -> None:
+        staged.temp_path.unlink(missing_ok=True)
+
+    def iter_blobs(self) -> Iterator[Path]:
+        for path in self.blob_dir.glob('??/??/*'):
+            if path.is_file():
+                yield path
+
+
+def acquire_blob(db: Session, store: BlobStore, staged: StagedBlob) -> Path:
+    """Take a reference on ``staged`` and move it into the store.
+
+    The reference is taken before the file is renamed into place: the row
+    lock held by the increment keeps the garbage collector away from this
+    blob until the caller commits.
+    """
+    path = store.path_for(staged.sha256)
+    incremented = db.execute(
+        update(FileBlob)
+        .where(FileBlob.sha256 == staged.sha256)
+        .values(ref_count=FileBlob.ref_count + 1)
+    ).rowcount
+    if not incremented:
+        try:
+            with db.begin_nested():
+                db.add(FileBlob(sha256=staged.sha256, path=str(path), size=staged.size, ref_count=1))
+        except IntegrityError:
+            # Another upload of the same content created the row first
+            db.execute(
+                update(FileBlob)
+                .where(FileBlob.sha256 == staged.sha256)
+                .values(ref_count=FileBlob.ref_count + 1)
+            )
+    return store.commit(staged)
+
+
+def release_blob(db: Session, sha256: str) -> None:
+    # Only the counter is touched here; files are removed by the collector
+    db.execute(
+        update(FileBlob)
+        .where(FileBlob.sha256 == sha256)
+        .values(ref_count=FileBlob.ref_count - 1)
+    )
+
+
+def collect_garbage(db: Session, store: BlobStore, grace: int = BLOB_GC_GRACE, batch_size: int = 500) -> Dict[str, int]:
+    stats = {'blobs_deleted': 0, 'orphans_deleted': 0, 'temp_files_deleted': 0}
+    cutoff = datetime.utcnow() - timedelta(seconds=grace)
+
+    # Unreferenced blobs. The row is deleted before the file so its lock is
+    # held while unlinking; a concurrent acquire_blob() waits and recreates it.
+    while True:
+        candidates = db.execute(
+            select(FileBlob.sha256)
+            .where(FileBlob.ref_count <= 0, FileBlob.updated_at < cutoff)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        ).scalars().all()
+        if not candidates:
+            break
+        for sha256 in candidates:
+            db.execute(delete(FileBlob).where(FileBlob.sha256 == sha256))
+            store.path_for(sha256).unlink(missing_ok=True)
+        db.commit()
+        stats['blobs_deleted'] += len(candidates)
+        if len(candidates) < batch_size:
+            break
+
+    # Files on disk without a row, e.g. left behind by a failed upload
+    oldest = time.time() - grace
+    stale = []
+    for path in store.iter_blobs():
+        if path.stat().st_mtime < oldest:
+            stale.append(path)
+        if len(stale) >= batch_size:
+            stats['orphans_deleted'] += _delete_orphans(db, stale)
+            stale = []
+    stats['orphans_deleted'] += _delete_orphans(db, stale)
+    db.rollback()
+
+    for path in store.tmp_dir.iterdir():
+        if path.is_file() and path.stat().st_mtime < oldest:
+            path.unlink(missing_ok=True)
+            stats['temp_files_deleted'] += 1
+
+    return stats
+
+
+def _delete_orphans(db: Session, paths) -> int:
+    if not paths:
+        return 0
+    known = set(db.execute(
+        select(FileBlob.sha256).where(FileBlob.sha256.in_([path.name for path in paths]))
+    ).scalars())
+    deleted = 0
+    for path in paths:
+        if path.name not in known:
+            path.unlink(missing_ok=True)
+            deleted += 1
+    return deleted
+
+
+def reconcile_ref_counts(db: Session) -> int:
+    # Versions removed without release_blob() (e.g. cascading user deletes)
+    # leave counts too high; recount references from resume_versions instead.
+    references = (
+        select(func.count(ResumeVersion.id))
+        .where(ResumeVersion.file_hash == FileBlob.sha256)
+        .scalar_subquery()
+    )
+    updated = db.execute(
+        update(FileBlob)
+        .where(FileBlob.ref_count != references)
+        .values(ref_count=references),
+        execution_options={'synchronize_session': False}
+    ).rowcount
+    db.commit()
+    return updated
+
+
+def migrate_legacy_files(db: Session, store: BlobStore, batch_size: int = 500) -> int:
+    """Move pre-blob-store uploads (``uploads/<uuid>.pdf``) into the store."""
+    migrated = 0
+    while True:
+        versions = db.execute(
+            select(ResumeVersion)
+            .where(ResumeVersion.file_hash.is_(None), ResumeVersion.file_path.isnot(None))
+            .limit(batch_size)
+        ).scalars().all()
+        if not versions:
+            break
+        moved = []
+        for version in versions:
+            legacy_path = Path(version.file_path)
+            if not legacy_path.is_file():
+                version.file_path = None
+                continue
+            with open(legacy_path, 'rb') as source:
+                staged = store.stage(source)
+            version.file_path = str(acquire_blob(db, store, staged))
+            version.file_hash = staged.sha256
+            version.file_size = staged.size
+            moved.append(legacy_path)
+        db.commit()
+        for legacy_path in moved:
+            legacy_path.unlink(missing_ok=True)
+        migrated += len(moved)
+    return migrated
+
+
+def remove_legacy_file(path: str) -> None:
+    try:
+        Path(path).unlink(missing_ok=True)
+    except OSError:
+        logger.exception("Could not delete legacy upload %s", path)
+
+
+def run_garbage_collector(store: Optional[BlobStore] = None) -> Dict[str, int]:
+    from database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        stats = collect_garbage(db, store or BlobStore(UPLOAD_DIR))
+        logger.info("Blob garbage collection finished: %s", stats)
+        return stats
+    finally:
+        db.close()
+
+
+async def garbage_collector_loop(store: BlobStore, interval: int) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await asyncio.to_thread(run_garbage_collector, store)
+        except Exception:
+            logger.exception("Blob garbage collection failed")
+
+
+def main(argv=None) -> None:
+    from database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Maintain the content-addressed upload store")
+    parser.add_argument('command', choices=('gc', 'reconcile', 'migrate'))
+    parser.add_argument('--grace', type=int, default=BLOB_GC_GRACE, help="Seconds before unreferenced blobs are removed")
+    args = parser.parse_args(argv)
+
+    store = BlobStore(UPLOAD_DIR)
+    db = SessionLocal()
+    try:
+        if args.command == 'gc':
+            print(collect_garbage(db, store, grace=args.grace))
+        elif args.command == 'reconcile':
+            print(f"Updated {reconcile_ref_counts(db)} reference counts")
+        else:
+            print(f"Migrated {migrate_legacy_files(db, store)} files")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
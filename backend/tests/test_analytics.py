@@ -0,0 +1,62 @@
+from datetime import datetime, timedelta
+
+from analytics import get_summary, record_version, remove_version
+from models import ResumeVersion, UserScoreSummary
+
+
+def add_version(db, day, score, section_scores):
+    version = ResumeVersion(
+        user_id="u1", content="resume", score=score, version_name=f"v{day}",
+        created_at=datetime(2024, 1, 1) + timedelta(days=day), section_scores=section_scores
+    )
+    db.add(version)
+    db.flush()
+    record_version(db, version)
+    db.commit()
+    return version
+
+
+def test_summary_is_maintained_on_insert_and_delete(db):
+    add_version(db, 0, 60, {"skills": 40, "experience": 70})
+    second = add_version(db, 7, 75, {"skills": 80, "experience": 72})
+
+    summary = get_summary(db, "u1")
+    assert [point["score"] for point in summary["score_history"]] == [60, 75]
+    assert summary["best_score"] == 75
+    assert summary["most_improved"] == [{"section": "skills", "change": 40}, {"section": "experience", "change": 2}]
+
+    remove_version(db, second)
+    db.delete(second)
+    db.commit()
+    summary = get_summary(db, "u1")
+    assert summary["version_count"] == 1
+    assert summary["latest_score"] == 60
+    assert summary["most_improved"] == []
+
+
+def test_summary_is_built_lazily_for_existing_versions(db):
+    db.add(ResumeVersion(user_id="u1", content="resume", score=50, version_name="old",
+                         created_at=datetime(2023, 1, 1), section_scores={"skills": 50}))
+    db.commit()
+    assert get_summary(db, "u1")["version_count"] == 1
+    assert get_summary(db, "missing") is None
+
+
+def test_first_save_for_user_with_existing_versions_includes_them(db):
+    for day in range(3):
+        db.add(ResumeVersion(user_id="u1", content="resume", score=50 + day, version_name=f"old{day}",
+                             created_at=datetime(2023, 1, 1) + timedelta(days=day), section_scores={"skills": 50}))
+    db.commit()
+
+    fourth = add_version(db, 10, 80, {"skills": 90})
+    summary = get_summary(db, "u1")
+    assert summary["version_count"] == 4
+    assert summary["first_score"] == 50
+    assert summary["latest_score"] == 80
+
+    db.query(UserScoreSummary).delete()
+    db.commit()
+    remove_version(db, fourth)
+    db.delete(fourth)
+    db.commit()
+    assert get_summary(db, "u1")["version_count"] == 3
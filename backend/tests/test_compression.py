@@ -0,0 +1,59 @@
+import gzip
+
+import brotli
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse, Response, StreamingResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from compression import CompressionMiddleware, choose_encoding
+
+BODY = "resume analysis " * 500
+
+
+def make_client():
+    async def large(request):
+        return PlainTextResponse(BODY)
+
+    async def small(request):
+        return PlainTextResponse("ok")
+
+    async def stream(request):
+        return StreamingResponse(iter([BODY.encode()] * 3), media_type="application/x-ndjson")
+
+    async def archive(request):
+        return Response(BODY.encode(), media_type="application/zip")
+
+    app = Starlette(routes=[Route(path, endpoint) for path, endpoint in
+                            [("/large", large), ("/small", small), ("/stream", stream), ("/zip", archive)]])
+    app.add_middleware(CompressionMiddleware, minimum_size=500)
+    return TestClient(app)
+
+
+def raw_get(client, path, accept_encoding):
+    with client.stream("GET", path, headers={"Accept-Encoding": accept_encoding}) as response:
+        return response, b"".join(response.iter_raw())
+
+
+def test_choose_encoding():
+    assert choose_encoding("gzip, deflate, br") == "br"
+    assert choose_encoding("gzip, br;q=0") == "gzip"
+    assert choose_encoding("identity") is None
+
+
+def test_compresses_large_and_streamed_responses():
+    client = make_client()
+    response, body = raw_get(client, "/large", "br")
+    assert response.headers["content-encoding"] == "br"
+    assert brotli.decompress(body).decode() == BODY
+
+    response, body = raw_get(client, "/stream", "gzip")
+    assert response.headers["content-encoding"] == "gzip"
+    assert gzip.decompress(body).decode() == BODY * 3
+
+
+def test_skips_small_and_precompressed_responses():
+    client = make_client()
+    for path in ("/small", "/zip"):
+        response, _ = raw_get(client, path, "gzip, br")
+        assert "content-encoding" not in response.headers
@@ -0,0 +1,95 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+
+import dedup
+from dedup import (backfill, find_identical, find_similar, index_version, minhash, pack_signature,
+                   remove_version, similarity, unpack_signature)
+from models import LshBucket, ResumeVersion
+
+WORDS = ("python developer with eight years of experience building distributed data pipelines "
+         "led a team of five engineers migrating batch jobs to streaming kafka and spark "
+         "reduced infrastructure cost by thirty percent designed internal tooling for deployment "
+         "mentored junior developers and ran weekly code reviews across three product teams").split()
+RESUME = ' '.join(WORDS * 2)
+EDITED = RESUME.replace("five engineers", "six engineers")
+OTHER = ("registered nurse with icu and emergency department experience certified in advanced "
+         "cardiac life support coordinated patient care plans with physicians and families")
+
+
+def add_version(db, version_id, content, day=0, ruleset_version=1, index=True):
+    version = ResumeVersion(
+        id=version_id, user_id="u1", content=content, score=70, version_name=version_id,
+        created_at=datetime(2024, 1, 1) + timedelta(days=day), ruleset_version=ruleset_version
+    )
+    db.add(version)
+    db.flush()
+    if index:
+        index_version(db, version, minhash(content))
+    db.commit()
+    return version
+
+
+def test_signature_similarity_tracks_jaccard():
+    assert similarity(minhash(RESUME), minhash(RESUME)) == 1.0
+    assert similarity(minhash(RESUME), minhash(EDITED)) > 0.8
+    assert similarity(minhash(RESUME), minhash(OTHER)) < 0.1
+    assert minhash("   ") is None
+    signature = minhash(RESUME)
+    assert unpack_signature(pack_signature(signature)) == signature
+
+
+def test_find_similar_returns_near_duplicates_best_first(db):
+    add_version(db, "original", RESUME)
+    add_version(db, "edited", EDITED, day=1)
+    add_version(db, "other", OTHER, day=2)
+
+    matches = find_similar(db, minhash(RESUME))
+    assert [version_id for version_id, _ in matches] == ["original", "edited"]
+    assert matches[0][1] == 1.0
+    assert find_similar(db, minhash(RESUME), exclude_id="original")[0][0] == "edited"
+
+
+def test_find_identical_requires_same_content_and_ruleset(db):
+    add_version(db, "old-rules", RESUME, ruleset_version=0)
+    matches = find_similar(db, minhash(RESUME))
+    assert find_identical(db, RESUME, matches, 1) is None
+
+    add_version(db, "current", RESUME, day=1)
+    matches = find_similar(db, minhash(RESUME))
+    assert find_identical(db, RESUME, matches, 1).id == "current"
+    assert find_identical(db, RESUME + " extra", matches, 1) is None
+
+
+def test_remove_version_clears_buckets_and_flags(db):
+    original = add_version(db, "original", RESUME)
+    copy = add_version(db, "copy", EDITED, day=1)
+    copy.duplicate_of = original.id
+    db.commit()
+
+    remove_version(db, original)
+    db.delete(original)
+    db.commit()
+    assert db.execute(select(LshBucket).where(LshBucket.version_id == "original")).first() is None
+    db.refresh(copy)
+    assert copy.duplicate_of is None
+
+
+def test_backfill_indexes_oldest_first_and_flags_copies(session_factory, db):
+    add_version(db, "b-copy", EDITED, day=3, index=False)
+    add_version(db, "a-original", RESUME, day=0, index=False)
+    add_version(db, "c-other", OTHER, day=5, index=False)
+
+    assert backfill(session_factory, batch_size=2) == (3, 1)
+    db.expire_all()
+    assert db.get(ResumeVersion, "b-copy").duplicate_of == "a-original"
+    assert db.get(ResumeVersion, "a-original").duplicate_of is None
+    assert backfill(session_factory) == (0, 0)
+
+
+def test_find_similar_reads_a_bounded_number_of_rows_per_bucket(db, monkeypatch):
+    for index in range(5):
+        add_version(db, f"copy{index}", RESUME, day=index)
+    monkeypatch.setattr(dedup, "MAX_BUCKET_ROWS", 2)
+    # Every bucket holds all five copies, but only two rows are read from each
+    assert [version_id for version_id, _ in find_similar(db, minhash(RESUME))] == ["copy0", "copy1"]
@@ -0,0 +1,30 @@
+import io
+import json
+import zipfile
+from datetime import datetime
+
+from types import SimpleNamespace
+
+from export import _ZipStream, version_to_ndjson
+
+
+def test_version_to_ndjson_serializes_datetimes():
+    row = SimpleNamespace(_mapping={"id": "v1", "score": 87.5, "created_at": datetime(2024, 1, 2, 3, 4, 5)})
+    line = version_to_ndjson(row)
+    assert line.endswith(b"\n")
+    assert json.loads(line) == {"id": "v1", "score": 87.5, "created_at": "2024-01-02T03:04:05"}
+
+
+def test_zip_stream_produces_readable_archive():
+    stream = _ZipStream()
+    chunks = []
+    with zipfile.ZipFile(stream, mode='w') as archive:
+        with archive.open('versions.ndjson', mode='w') as member:
+            for i in range(3):
+                member.write(f'{{"id": {i}}}\n'.encode())
+                chunks.append(stream.drain())
+    chunks.append(stream.drain())
+
+    with zipfile.ZipFile(io.BytesIO(b''.join(chunks))) as archive:
+        lines = archive.read('versions.ndjson').splitlines()
+    assert [json.loads(line)["id"] for line in lines] == [0, 1, 2]
@@ -0,0 +1,40 @@
+import io
+
+import docx
+import fitz
+
+from extractors import DOCX, PDF, TXT, detect_mime_type, extract_text
+
+
+def make_pdf(text):
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), text)
+    return io.BytesIO(doc.tobytes())
+
+
+def make_docx():
+    document = docx.Document()
+    document.add_paragraph("EXPERIENCE")
+    table = document.add_table(rows=1, cols=2)
+    table.rows[0].cells[0].text = "Tech Corp"
+    table.rows[0].cells[1].text = "2020-2023"
+    document.add_paragraph("SKILLS")
+    document.add_paragraph("Python, Docker")
+    buffer = io.BytesIO()
+    document.save(buffer)
+    buffer.seek(0)
+    return buffer
+
+
+def test_detects_formats_from_content():
+    assert detect_mime_type(make_pdf("Resume")) == PDF
+    assert detect_mime_type(make_docx()) == DOCX
+    assert detect_mime_type(io.BytesIO("Résumé\nSKILLS".encode())) == TXT
+    assert detect_mime_type(io.BytesIO(b"\x89PNG\r\n\x1a\n\x00\x00")) is None
+    assert detect_mime_type(io.BytesIO(b"PK\x03\x04not a docx")) is None
+
+
+def test_extractors_feed_plain_text():
+    assert "Software Engineer" in extract_text(make_pdf("Software Engineer"), PDF)
+    assert extract_text(make_docx(), DOCX) == "EXPERIENCE\nTech Corp\t2020-2023\nSKILLS\nPython, Docker"
+    assert extract_text(io.BytesIO(b"\xef\xbb\xbfSUMMARY\r\nEngineer"), TXT) == "SUMMARY\nEngineer"
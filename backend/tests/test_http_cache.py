@@ -0,0 +1,29 @@
+from datetime import datetime
+
+from starlette.requests import Request
+
+from http_cache import cache_headers, http_date, is_not_modified, make_etag
+
+
+def make_request(**headers):
+    return Request({
+        'type': 'http',
+        'headers': [(name.replace('_', '-').encode(), value.encode()) for name, value in headers.items()],
+    })
+
+
+def test_etag_matching():
+    etag = make_etag("versions", "u1", 3, "2024-01-01T00:00:00")
+    assert etag != make_etag("versions", "u1", 4, "2024-01-01T00:00:00")
+    assert is_not_modified(make_request(if_none_match=etag), etag)
+    assert is_not_modified(make_request(if_none_match=f'"other", {etag[2:]}'), etag)
+    assert not is_not_modified(make_request(if_none_match='"other"'), etag)
+    assert not is_not_modified(make_request(), etag)
+
+
+def test_if_modified_since():
+    modified = datetime(2024, 1, 1, 12, 0, 0, 500000)
+    headers = cache_headers(make_etag("x"), modified, "private, no-cache")
+    assert headers['Last-Modified'] == "Mon, 01 Jan 2024 12:00:00 GMT"
+    assert is_not_modified(make_request(if_modified_since=http_date(modified)), make_etag("x"), modified)
+    assert not is_not_modified(make_request(if_modified_since="Sun, 31 Dec 2023 12:00:00 GMT"), make_etag("x"), modified)
@@ -0,0 +1,99 @@
+import threading
+
+from languages import (DEFAULT_LANGUAGE, LANGUAGES, UNKNOWN_LANGUAGE, ModelPool, detect_language,
+                       get_language, section_patterns)
+
+ENGLISH = ("I am a software engineer with five years of experience in the design of systems for "
+           "payments and I was responsible for the migration of our services to the cloud at scale")
+SPANISH = ("Soy ingeniero de software con cinco años de experiencia en el diseño de sistemas para "
+           "pagos y fui responsable de la migración de los servicios a la nube para la empresa")
+GERMAN = ("Ich bin Softwareentwickler mit fünf Jahren Erfahrung in der Entwicklung von Systemen für "
+          "den Zahlungsverkehr und war für die Migration der Dienste in die Cloud bei der Firma zuständig")
+RUSSIAN = ("Я инженер программного обеспечения с пятилетним опытом проектирования платёжных систем "
+           "и отвечал за перенос сервисов в облако в нашей компании в течение двух лет подряд")
+TERSE_ENGLISH = """Jane Doe
+jane.doe@example.com | github.com/janedoe
+SKILLS
+Python, Go, PostgreSQL, Redis, Kafka, Docker, Kubernetes, Terraform, AWS
+EXPERIENCE
+Senior Engineer, Acme Payments 2019-2024
+- Led migration of billing services to Kubernetes
+- Cut p99 latency 40% via Redis caching
+- Designed event pipeline processing 2M events/day
+- Mentored four engineers
+Engineer, Initech 2016-2019
+- Built internal deploy tooling
+- Automated release process, saving 10 hours/week
+EDUCATION
+B.S. Computer Science, State University 2016"""
+
+
+def test_detect_language():
+    assert detect_language(ENGLISH) == 'en'
+    assert detect_language(SPANISH) == 'es'
+    assert detect_language(GERMAN) == 'de'
+    assert detect_language(TERSE_ENGLISH) == 'en'
+    assert detect_language(RUSSIAN) == UNKNOWN_LANGUAGE
+    assert detect_language("Jane Doe\njane@example.com") == DEFAULT_LANGUAGE
+
+
+def test_section_patterns_add_language_headers_to_english():
+    assert section_patterns('es')['experience'].search("EXPERIENCIA PROFESIONAL")
+    assert section_patterns('es')['experience'].search("Work History")
+    assert not section_patterns('en')['experience'].search("Trayectoria")
+    assert get_language('zz') is LANGUAGES[UNKNOWN_LANGUAGE]
+
+
+def test_model_pool_loads_lazily_and_evicts_least_recent():
+    loaded = []
+    pool = ModelPool(maxsize=2, loader=lambda model: loaded.append(model) or model)
+
+    assert pool.get('en') == 'en_core_web_sm'
+    assert pool.get('es') == 'es_core_news_sm'
+    assert pool.get('en') == 'en_core_web_sm'
+    assert pool.get('fr') == 'fr_core_news_sm'  # evicts es, the least recently used
+    assert pool.get('es') == 'es_core_news_sm'
+    assert pool.get('de') is None  # regex-only, nothing to load
+    assert loaded == ['en_core_web_sm', 'es_core_news_sm', 'fr_core_news_sm', 'es_core_news_sm']
+    assert pool.stats()['loaded'] == ['fr', 'es']
+    assert pool.stats()['evictions'] == 2
+
+
+def test_model_pool_remembers_missing_pipelines():
+    calls = []
+
+    def loader(model):
+        calls.append(model)
+        raise OSError(f"Can't find model '{model}'")
+
+    pool = ModelPool(loader=loader)
+    assert pool.get('fr') is None
+    assert pool.get('fr') is None
+    assert pool.get(UNKNOWN_LANGUAGE) is None
+    assert calls == ['fr_core_news_sm']
+    assert pool.stats()['unavailable'] == ['fr']
+
+
+def test_model_pool_loads_once_under_concurrency():
+    calls = []
+    release = threading.Event()
+
+    def loader(model):
+        calls.append(model)
+        release.wait(1)
+        return model
+
+    pool = ModelPool(loader=loader)
+    threads = [threading.Thread(target=pool.get, args=('pt',)) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert calls == ['pt_core_news_sm']
+
+
+def test_pipelines_declare_their_passive_labels():
+    for config in LANGUAGES.values():
+        # A parse is only worth loading if its passive relations are known
+        assert config.model is None or config.passive_deps
@@ -0,0 +1,44 @@
+import pytest
+
+from loadtest import LevelResult, find_knee, parse_mix, percentile
+
+
+def test_parse_mix():
+    assert parse_mix("analyze=3,versions=1") == {"analyze": 3.0, "versions": 1.0}
+    with pytest.raises(ValueError):
+        parse_mix("upload=1")
+
+
+def test_percentiles_and_summary():
+    values = [i / 1000 for i in range(1, 101)]
+    assert percentile(values, 50) == 0.05
+    assert percentile(values, 99) == 0.099
+
+    result = LevelResult(concurrency=4, duration=2.0)
+    result.latencies['versions'] = values
+    result.errors['versions'] = 25
+    summary = result.summary()
+    # Failed requests count towards the error rate only
+    assert summary['throughput'] == 50
+    assert summary['endpoints']['versions']['requests'] == 125
+    assert summary['endpoints']['versions']['error_rate'] == 0.2
+    assert summary['endpoints']['versions']['p99_ms'] == 99
+
+
+def test_pool_summary():
+    result = LevelResult(concurrency=4, duration=1.0)
+    for busy, queued, in_flight in [(2, 0, 2), (5, 3, 5)]:
+        result.pool_samples.append({
+            'db_pool': {'size': 5, 'max_overflow': 10, 'checked_out': 1, 'overflow': 0},
+            'threadpool': {'total': 40, 'in_use': 1},
+            'executor': {'total': 5, 'threads': 5, 'busy': busy, 'queued': queued},
+            'analysis_admission': {'limit': 5, 'in_flight': in_flight},
+        })
+    pools = result.summary()['pools']
+    assert (pools['executor_busy_max'], pools['executor_queued_max'], pools['executor_total']) == (5, 3, 5)
+    assert (pools['analyses_in_flight_max'], pools['analyses_limit']) == (5, 5)
+
+
+def test_find_knee():
+    curve = [{'concurrency': c, 'throughput': t} for c, t in [(1, 10), (2, 19), (4, 35), (8, 36), (16, 30)]]
+    assert find_knee(curve) == 4
@@ -1,13 +1,18 @@
+from datetime import datetime
+
 import pytest
 from fastapi.testclient import TestClient
+
+from database import get_db
 from main import app
+from models import ResumeVersion
 
 client = TestClient(app)
 
 def test_analyze_endpoint_invalid_file():
-    response = client.post("/analyze", files={"file": ("test.txt", b"test content")})
+    response = client.post("/analyze", files={"file": ("resume.pdf", b"\x89PNG\r\n\x1a\n\x00\x00")})
     assert response.status_code == 400
-    assert "Only PDF files are supported" in response.json()["detail"]
+    assert "Unsupported file type" in response.json()["detail"]
 
 def test_analyze_endpoint_no_file():
     response = client.post("/analyze")
@@ -23,4 +28,45 @@ def test_analyze_endpoint_success():
     assert "metrics" in data
     assert "suggestions" in data
     assert "strengths" in data
-    assert "weaknesses" in data 
\ No newline at end of file
+    assert "weaknesses" in data 
+
+def test_analyze_endpoint_unknown_fields():
+    response = client.post("/analyze?fields=score,metrics", files={"file": ("resume.txt", b"SKILLS\nPython")})
+    assert response.status_code == 400
+    assert "metrics" in response.json()["detail"]
+
+def test_analyze_endpoint_projection():
+    response = client.post(
+        "/analyze?fields=score,sections&include_details=false",
+        files={"file": ("resume.txt", b"SKILLS\nPython, Docker, AWS")}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert set(data) == {"score", "sections"}
+    assert all("details" not in section for section in data["sections"].values())
+
+
+def test_versions_list_is_not_cached_across_deletes(session_factory):
+    def override_get_db():
+        with session_factory() as db:
+            yield db
+
+    with session_factory() as db:
+        for index in range(2):
+            db.add(ResumeVersion(id=f"v{index}", user_id="u1", content="SKILLS\nPython", score=50,
+                                 version_name=f"v{index}", created_at=datetime(2024, 1, 1 + index)))
+        db.commit()
+
+    app.dependency_overrides[get_db] = override_get_db
+    try:
+        first = client.get("/versions/u1")
+        assert "Last-Modified" not in first.headers
+        # Deleting the older version leaves the newest modification time unchanged
+        assert client.delete("/versions/v0").status_code == 200
+        response = client.get("/versions/u1", headers={"If-Modified-Since": "Fri, 01 Jan 2100 00:00:00 GMT"})
+        assert response.status_code == 200
+        assert [version["id"] for version in response.json()] == ["v1"]
+        response = client.get("/versions/u1", headers={"If-None-Match": first.headers["ETag"]})
+        assert response.status_code == 200
+    finally:
+        del app.dependency_overrides[get_db]
@@ -0,0 +1,78 @@
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+
+from models import RateLimitCounter
+from ratelimit import AdmissionController, DatabaseRateLimiter, RateLimitMiddleware, TokenBucketLimiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_token_bucket_refills_over_time():
+    clock = FakeClock()
+    limiter = TokenBucketLimiter(rate=1, capacity=2, clock=clock)
+    assert limiter.acquire("ip:1") == 0
+    assert limiter.acquire("ip:1") == 0
+    assert limiter.acquire("ip:1") == 1.0
+    assert limiter.acquire("ip:2") == 0
+    clock.now += 1
+    assert limiter.acquire("ip:1") == 0
+
+
+def test_database_limiter_counts_per_window():
+    engine = create_engine("sqlite://")
+    RateLimitCounter.__table__.create(engine)
+    clock = FakeClock()
+    limiter = DatabaseRateLimiter(engine, limit=2, window=60, clock=clock)
+    assert [limiter.acquire("ip:1") for _ in range(3)] == [0, 0, 20.0]
+    clock.now += 20
+    assert limiter.acquire("ip:1") == 0
+
+
+def test_admission_controller_rejects_beyond_limit():
+    admission = AdmissionController(limit=1)
+    assert admission.try_acquire()
+    assert not admission.try_acquire()
+    admission.release()
+    assert admission.try_acquire()
+
+
+def test_admission_slot_is_taken_after_the_body_and_released():
+    admission = AdmissionController(limit=1)
+    app = FastAPI()
+
+    @app.post("/work")
+    async def work(_slot: None = Depends(admission.slot)):
+        return {"in_flight": admission.in_flight}
+
+    client = TestClient(app)
+    assert client.post("/work").json() == {"in_flight": 1}
+    assert admission.in_flight == 0
+
+    admission.try_acquire()
+    response = client.post("/work")
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+
+def test_rate_limit_ignores_unauthenticated_user_id():
+    app = FastAPI()
+    app.add_middleware(RateLimitMiddleware, paths=["/work"],
+                       limiter=TokenBucketLimiter(rate=0.001, capacity=1, clock=FakeClock()))
+
+    @app.post("/work")
+    async def work():
+        return {}
+
+    client = TestClient(app)
+    assert client.post("/work?user_id=victim").status_code == 200
+    # Keyed by IP alone: a different user_id doesn't get a fresh budget
+    response = client.post("/work?user_id=other")
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) > 0
@@ -0,0 +1,121 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import select
+
+from analytics import get_summary, record_version
+from models import ResumeVersion, User, UserScoreSummary
+import rescore as rescore_module
+from rescore import load_checkpoint, rescore
+
+
+def fake_analyze_batch(rows):
+    return [
+        {'id': version_id, 'score': float(len(content)), 'section_scores': {'skills': 1.0}, 'ruleset_version': 2}
+        for version_id, content in rows
+    ]
+
+
+def add_versions(session_factory, count=10):
+    with session_factory() as db:
+        db.add(UserScoreSummary(user_id="u1", version_count=0, score_history=[], section_history={}, most_improved=[]))
+        for index in range(count):
+            db.add(ResumeVersion(
+                id=f"v{index:02d}", user_id="u1", content="x" * (index + 1), score=0,
+                version_name=f"v{index}", ruleset_version=1 if index % 2 else None
+            ))
+        db.commit()
+
+
+def test_rescore_updates_versions_and_rebuilds_summaries(tmp_path, session_factory):
+    add_versions(session_factory)
+    checkpoint_path = tmp_path / "checkpoint.json"
+    with ThreadPoolExecutor(2) as executor:
+        checkpoint = rescore(session_factory, executor, 2, batch_size=3, checkpoint_path=checkpoint_path,
+                             analyze_batch=fake_analyze_batch)
+
+    assert checkpoint['processed'] == 10
+    assert json.loads(checkpoint_path.read_text())['last_key'] == ["u1", "v09"]
+    with session_factory() as db:
+        versions = db.execute(select(ResumeVersion).order_by(ResumeVersion.id)).scalars().all()
+        assert [version.score for version in versions] == [float(i + 1) for i in range(10)]
+        assert {version.ruleset_version for version in versions} == {2}
+        summary = get_summary(db, "u1")
+        assert summary["version_count"] == 10
+        assert summary["best_score"] == 10.0
+
+        # A save after the rescore keeps every rescored version in the summary
+        version = ResumeVersion(id="v10", user_id="u1", content="new", score=50, version_name="v10",
+                                section_scores={'skills': 2.0}, ruleset_version=2)
+        db.add(version)
+        db.flush()
+        record_version(db, version)
+        db.commit()
+        summary = get_summary(db, "u1")
+        assert summary["version_count"] == 11
+        assert summary["best_score"] == 50
+
+
+def test_rescore_resumes_from_checkpoint(tmp_path, session_factory):
+    add_versions(session_factory)
+    checkpoint_path = tmp_path / "checkpoint.json"
+    with ThreadPoolExecutor(1) as executor:
+        first = rescore(session_factory, executor, 2, batch_size=2, checkpoint_path=checkpoint_path, limit=4,
+                        analyze_batch=fake_analyze_batch)
+        assert first['last_key'] == ["u1", "v03"]
+        second = rescore(session_factory, executor, 2, batch_size=2, checkpoint_path=checkpoint_path,
+                         analyze_batch=fake_analyze_batch)
+
+    assert second['processed'] == 10
+    # Nothing is left under the old ruleset, so a further run is a no-op
+    with ThreadPoolExecutor(1) as executor:
+        assert rescore(session_factory, executor, 2, analyze_batch=fake_analyze_batch)['processed'] == 0
+
+
+def test_checkpoint_for_another_ruleset_is_ignored(tmp_path):
+    path = tmp_path / "checkpoint.json"
+    path.write_text(json.dumps({'ruleset_version': 1, 'last_key': ["u1", "v05"], 'pending_user': "u1", 'processed': 6}))
+    assert load_checkpoint(path, 2) == {'ruleset_version': 2, 'last_key': None, 'pending_user': None, 'processed': 0}
+    assert load_checkpoint(path, 1)['last_key'] == ["u1", "v05"]
+
+
+def test_versions_deleted_during_analysis_are_skipped(session_factory):
+    add_versions(session_factory, count=4)
+
+    def analyze_then_delete(rows):
+        # A user deletes a version after it was read but before its score is written
+        with session_factory() as db:
+            db.query(ResumeVersion).filter(ResumeVersion.id == "v01").delete()
+            db.commit()
+        return fake_analyze_batch(rows)
+
+    with ThreadPoolExecutor(1) as executor:
+        checkpoint = rescore(session_factory, executor, 2, batch_size=10, analyze_batch=analyze_then_delete)
+
+    assert checkpoint['processed'] == 4
+    with session_factory() as db:
+        assert db.execute(select(ResumeVersion.id).order_by(ResumeVersion.id)).scalars().all() == ["v00", "v02", "v03"]
+        assert get_summary(db, "u1")["version_count"] == 3
+
+
+def test_each_user_summary_is_rebuilt_once(session_factory, monkeypatch):
+    with session_factory() as db:
+        for user_id in ("u2", "u3"):
+            db.add(User(id=user_id, email=f"{user_id}@example.com", password_hash=""))
+        for index in range(9):
+            user_id = ("u1", "u2", "u3")[index % 3]
+            db.add(ResumeVersion(id=f"v{index:02d}", user_id=user_id, content="x" * (index + 1), score=0,
+                                 version_name=f"v{index}"))
+        db.commit()
+
+    rebuilt = []
+    real_rebuild = rescore_module.rebuild_summary
+    monkeypatch.setattr(rescore_module, "rebuild_summary",
+                        lambda db, user_id: rebuilt.append(user_id) or real_rebuild(db, user_id))
+    with ThreadPoolExecutor(1) as executor:
+        # Batches of 2 split every user's three versions across batches
+        rescore(session_factory, executor, 2, batch_size=2, analyze_batch=fake_analyze_batch)
+
+    assert rebuilt == ["u1", "u2", "u3"]
+    with session_factory() as db:
+        assert get_summary(db, "u2")["version_count"] == 3
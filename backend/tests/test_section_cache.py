@@ -0,0 +1,26 @@
+from section_cache import SectionCache, section_key
+
+
+def test_only_changed_sections_are_recomputed():
+    cache = SectionCache(maxsize=10)
+    calls = []
+
+    def analyze(name, content):
+        key = section_key(name, 'software_engineering', 'en', content, 1)
+        return cache.get_or_compute(key, lambda: calls.append(name) or len(content))
+
+    first = {name: analyze(name, content) for name, content in [('skills', 'Python'), ('experience', 'Led a team')]}
+    second = {name: analyze(name, content) for name, content in [('skills', 'Python'), ('experience', 'Led two teams')]}
+
+    assert calls == ['skills', 'experience', 'experience']
+    assert first['skills'] == second['skills']
+    assert cache.stats() == {'size': 3, 'hits': 1, 'misses': 3}
+
+
+def test_language_ruleset_version_and_size_bound_the_cache():
+    cache = SectionCache(maxsize=2)
+    assert section_key('skills', 'general', 'en', 'Python', 1) != section_key('skills', 'general', 'en', 'Python', 2)
+    assert section_key('skills', 'general', 'en', 'Python', 1) != section_key('skills', 'general', 'de', 'Python', 1)
+    for i in range(5):
+        cache.get_or_compute(i, lambda: i)
+    assert cache.stats()['size'] == 2
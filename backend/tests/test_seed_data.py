@@ -0,0 +1,40 @@
+import random
+
+from sqlalchemy import select
+
+from analytics import rebuild_summary
+from models import ResumeVersion, User, UserScoreSummary
+from seed_data import TEST_USER_PREFIX, build_version_rows, clear_test_data, generate_resume, seed, seed_user
+
+
+def test_generated_resumes_vary_and_are_reproducible():
+    resumes = [generate_resume(random.Random(seed)) for seed in range(20)]
+    assert len(set(resumes)) == 20
+    assert generate_resume(random.Random(3)) == resumes[3]
+    assert all("EXPERIENCE" in resume and "SKILLS" in resume for resume in resumes)
+
+
+def test_version_rows_are_ordered_and_scored():
+    rows = list(build_version_rows("test_user_1", 25, random.Random(0)))
+    assert len({row['id'] for row in rows}) == 25
+    assert [row['created_at'] for row in rows] == sorted(row['created_at'] for row in rows)
+    assert all(0 <= row['score'] <= 100 for row in rows)
+
+
+def test_clear_test_data_removes_only_seeded_users(db):
+    rng = random.Random(0)
+    assert seed_user(db.connection(), f"{TEST_USER_PREFIX}one", 3, rng) == 3
+    seed(db.connection(), users=4, versions_per_user=2, rng=rng, batch_size=5)
+    db.add(ResumeVersion(id="kept", user_id="u1", content="x", score=50, version_name="Kept"))
+    test_users = db.execute(select(User.id).where(User.id.like(f"{TEST_USER_PREFIX}%"))).scalars().all()
+    assert len(test_users) == 5
+    for user_id in test_users + ["u1"]:
+        rebuild_summary(db, user_id)
+    db.commit()
+
+    assert clear_test_data(db.connection()) == 5
+    db.commit()
+
+    assert db.execute(select(User.id)).scalars().all() == ["u1"]
+    assert db.execute(select(ResumeVersion.id)).scalars().all() == ["kept"]
+    assert db.execute(select(UserScoreSummary.user_id)).scalars().all() == ["u1"]
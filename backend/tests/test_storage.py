@@ -0,0 +1,42 @@
+import io
+import os
+import time
+
+from models import FileBlob
+from storage import BlobStore, acquire_blob, collect_garbage, release_blob
+
+
+def test_identical_uploads_share_one_blob(tmp_path, db):
+    store = BlobStore(tmp_path)
+
+    paths = [acquire_blob(db, store, store.stage(io.BytesIO(b"%PDF-1.4 resume"))) for _ in range(2)]
+    db.commit()
+
+    assert paths[0] == paths[1]
+    assert paths[0].read_bytes() == b"%PDF-1.4 resume"
+    assert len(list(store.iter_blobs())) == 1
+    assert list(store.tmp_dir.iterdir()) == []
+    assert db.query(FileBlob).one().ref_count == 2
+
+
+def test_garbage_collector_removes_unreferenced_blobs(tmp_path, db):
+    store = BlobStore(tmp_path)
+    staged = store.stage(io.BytesIO(b"%PDF-1.4 resume"))
+    path = acquire_blob(db, store, staged)
+    db.commit()
+
+    release_blob(db, staged.sha256)
+    db.commit()
+    assert collect_garbage(db, store, grace=3600)['blobs_deleted'] == 0
+
+    orphan = store.path_for('ab' * 32)
+    orphan.parent.mkdir(parents=True)
+    orphan.write_bytes(b"orphan")
+    old = time.time() - 10
+    os.utime(orphan, (old, old))
+
+    stats = collect_garbage(db, store, grace=0)
+    assert stats['blobs_deleted'] == 1
+    assert stats['orphans_deleted'] == 1
+    assert not path.exists()
+    assert db.query(FileBlob).count() == 0
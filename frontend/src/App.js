@@ -290,7 +290,7 @@ function App() {
         <Paper sx={{ p: 3, mb: 3 }}>
           <Box sx={{ display: 'flex', flexDirection: 'column', alignItems: 'center', gap: 2 }}>
             <input
-              accept=".pdf"
+              accept=".pdf,.docx,.txt"
               style={{ display: 'none' }}
               id="resume-upload"
               type="file"